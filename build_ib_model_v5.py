@@ -13,13 +13,30 @@ v5 upgrade (vs v4):
   - ENHANCED: Cash_Flow with Working Capital detail
   - FIX: 2023 Cash & Securities corrected to ~$110.9B (was duplicated from 2024)
   - Source: Alphabet 2025 10-K (filed Feb 4 2026), pp.48-52 for financial statements
+
+Optional: if zlib-ng is installed (pip install zlib-ng), wb.save() deflates
+through it instead of stdlib zlib; the .xlsx produced is equivalent.
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.dimensions import ColumnDimension
+from openpyxl.worksheet.formula import ArrayFormula
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.utils import get_column_letter as CL
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.utils import get_column_letter, coordinate_to_tuple
+import io
 import os
+import zipfile
+
+try:  # faster drop-in deflate for wb.save(); stdlib zlib otherwise
+    from zlib_ng import zlib_ng
+    zipfile.zlib = zlib_ng
+except ImportError:
+    pass
 
 # ═══════════════════════════════════════════════════════
 #  STYLES
@@ -48,8 +65,36 @@ NI   = "#,##0"
 NP   = "0.0%"
 NP2  = "0.00%"
 NU   = "$#,##0.00"
+# Cell roles, registered on the workbook in build(); a single
+# cell.style assignment replaces separate font/fill/border writes per cell.
+HIST_STYLE   = NamedStyle("hist", font=FH, fill=GREY, border=BD)     # 2023A-2025A anchors
+INPUT_STYLE  = NamedStyle("input", font=FI, fill=BLUE, border=BD)    # Base/Bull/Bear inputs
+SELECT_STYLE = NamedStyle("select", font=FB, border=BD)              # SCEN_IDX-selected value
+SEC_STYLE    = NamedStyle("section", fill=SUB, border=BD)            # merged section band
+SECL_STYLE   = NamedStyle("section_label", font=FS, fill=SUB, border=BD)      # its title cell
+HDR_STYLE    = NamedStyle("hdr", font=FW, fill=HDR, alignment=CT, border=BD)  # header rows
+NOTE_STYLE   = NamedStyle("note", font=FNOTE, alignment=LT, border=BD)        # Notes column
+HVAL_STYLE   = NamedStyle("hval", font=FH, number_format=NI, border=BD)       # hval() default
+LINK_STYLE   = NamedStyle("link", font=FL, number_format=NI, border=BD)       # lval() default
+ASIDE_STYLE  = NamedStyle("aside", font=FNOTE, border=BD)    # unwrapped note (DCF/Key_Summary)
+AXIS_STYLE   = NamedStyle("axis", font=FB, fill=SUB, alignment=CT, border=BD)  # Sensitivity g axis
+CALC_STYLES  = tuple(NamedStyle(name, font=DEFAULT_FONT, number_format=fmt, border=BD)  # fval()
+                     for name, fmt in (("calc", NI), ("price", NU), ("days", "0.0"),
+                                       ("multiple", "0.0x"), ("multiple2", "0.00x"),
+                                       ("factor", "0.0000")))
+CALC_FMT     = {st.number_format: st.name for st in CALC_STYLES}
+PCT_STYLES   = (NamedStyle("pct", font=DEFAULT_FONT, number_format=NP, border=BD),  # pval()
+                NamedStyle("pct_sm", font=FSM, number_format=NP, border=BD))
+LABEL_STYLES = (NamedStyle("bold", font=FB, border=BD),                       # row_label()
+                NamedStyle("body", font=FN, border=BD),
+                NamedStyle("small", font=FSM, border=BD))
+BAND_STYLES  = (NamedStyle("key", font=FB, fill=KEY, border=BD),              # band()
+                NamedStyle("subtotal", font=FB, fill=SUB, border=BD),
+                NamedStyle("err", font=FB, fill=ERR, border=BD))
 YR   = [2023, 2024, 2025, "2026E", "2027E", "2028E", "2029E", "2030E"]
 NCOL = 11  # Notes column (K), avoids conflict with 2030E data in col J
+COL  = ("",) + tuple(get_column_letter(i) for i in range(1, 50))  # COL[1] == "A"
+assert NCOL < len(COL), "model wider than the COL letter table"
 
 # ═══════════════════════════════════════════════════════
 #  HISTORICAL DATA (from 10-K pp.48-52, Note 15)
@@ -64,6 +109,18 @@ SEG_REV = {
     "Other Bets":                 [1527, 1648, 1537],
 }
 HEDGE = [236, 211, -127]
+# 2024A/2025A YoY growth per segment, derived once from SEG_REV
+SEG_REV_G = {k: (v[1]/v[0]-1, v[2]/v[1]-1) for k, v in SEG_REV.items()}
+
+# Segment growth inputs 2026E-2030E, one row per SEG_REV segment (same order)
+BASE_G = ((.12,.10,.09,.08,.07),(.14,.12,.10,.09,.08),(-.02,-.02,-.01,-.01,0),
+          (.18,.15,.13,.11,.09),(.30,.25,.22,.18,.15),(.10,.15,.15,.15,.10))
+BULL_G = ((.15,.13,.11,.10,.09),(.18,.15,.13,.11,.10),(-.01,0,0,.01,.01),
+          (.22,.18,.15,.13,.11),(.38,.30,.25,.20,.17),(.15,.20,.20,.20,.15))
+BEAR_G = ((.08,.07,.06,.05,.04),(.08,.07,.06,.05,.04),(-.05,-.04,-.03,-.03,-.02),
+          (.12,.10,.09,.08,.07),(.22,.18,.15,.12,.10),(0,.05,.05,.05,.05))
+assert all(len(g) == len(SEG_REV) and all(len(row) == 5 for row in g)
+           for g in (BASE_G, BULL_G, BEAR_G)), "growth grid shape != segments x 5 years"
 
 # Consolidated P&L ($mm) - from p.49
 PL = {
@@ -156,111 +213,310 @@ CF = {
     "FX":         [-421, -612, 208],
 }
 
+# Source tie-outs: each subtotal above must foot in every historical year,
+# so a mistyped figure stops the build here rather than surfacing later
+# as a non-zero check row in Excel.
+_CFK = list(CF)
+FOOTINGS = (
+    ("Revenue",     PL["Revenue"],         [*SEG_REV.values(), HEDGE]),
+    ("COGS",        PL["COGS"],            [PL["TAC"], PL["OtherCOGS"]]),
+    ("EBIT",        PL["EBIT"],            [PL["Revenue"], *([-x for x in PL[k]] for k in ("COGS", "R&D", "S&M", "G&A"))]),
+    ("NI",          PL["NI"],              [PL["EBIT"], PL["OIE"], [-x for x in PL["Tax"]]]),
+    ("CashTotal",   BS_DATA["CashTotal"],  [BS_DATA[k] for k in ("Cash", "MktSec")]),
+    ("TotalCA",     BS_DATA["TotalCA"],    [BS_DATA[k] for k in ("CashTotal", "AR", "OtherCA")]),
+    ("TotalAssets", BS_DATA["TotalAssets"], [BS_DATA[k] for k in ("TotalCA", "NonMktSec", "DeferredTax", "PPE",
+                                                                  "OpLeaseAsset", "Goodwill", "OtherNCA")]),
+    ("TotalCL",     BS_DATA["TotalCL"],    [BS_DATA[k] for k in ("AP", "AccComp", "AccExp", "RevShare", "DefRev")]),
+    ("TotalLiab",   BS_DATA["TotalLiab"],  [BS_DATA[k] for k in ("TotalCL", "LTDebt", "TaxNC", "OpLeaseLiab", "OtherLTL")]),
+    ("L&E",         BS_DATA["TotalAssets"], [BS_DATA["TotalLiab"], BS_DATA["Equity"]]),
+    ("CFO",         CF["CFO"],             [CF[k] for k in _CFK[:_CFK.index("CFO")]]),
+    ("CFI",         CF["CFI"],             [CF[k] for k in _CFK[_CFK.index("CFO")+1:_CFK.index("CFI")]]),
+    ("CFF",         CF["CFF"],             [CF[k] for k in _CFK[_CFK.index("CFI")+1:_CFK.index("CFF")]]),
+)
+for _name, _total, _parts in FOOTINGS:
+    assert list(_total) == [sum(col) for col in zip(*_parts)], f"{_name} does not foot"
+
+# Cash_Flow rows that net two source lines; kept out of CF so the
+# footings above still see each line once.
+CF_NET = {k: [a + b for a, b in zip(CF[x], CF[y])] for k, (x, y) in {
+    "SecGLOther": ("SecGL", "Other"),
+    "MktSecNet":  ("BuyMktSec", "SellMktSec"),
+    "DebtNet":    ("DebtIssue", "DebtRepay"),
+}.items()}
+
 # ═══════════════════════════════════════════════════════
 #  HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════
-def apply_bd(ws, r, c):
-    ws.cell(row=r, column=c).border = BD
+class SheetBuf:
+    """Random-access front for a write-only worksheet.
+
+    Tabs are built (and back-filled by later tabs) through the usual
+    ws.cell / ws["A1"] calls; cells are WriteOnlyCells held in a dict and
+    streamed to the sheet in row order by flush() once the tab is final.
+    """
+
+    def __init__(self, wb, title):
+        self.ws = wb.create_sheet(title)
+        self.title = title
+        self.cells = {}
+        self.n_shared = 0  # next shared-formula index (si), unique per sheet
+
+    def cell(self, row, column, value=None):
+        c = self.cells.get((row, column))
+        if c is None:
+            c = self.cells[(row, column)] = WriteOnlyCell(self.ws)
+        if value is not None:
+            c.value = value
+        return c
+
+    def __getitem__(self, coord):
+        return self.cell(*coordinate_to_tuple(coord))
+
+    def __setitem__(self, coord, value):
+        self[coord].value = value
+
+    @property
+    def column_dimensions(self):
+        return self.ws.column_dimensions
+
+    @property
+    def freeze_panes(self):
+        return self.ws.freeze_panes
+
+    @freeze_panes.setter
+    def freeze_panes(self, coord):
+        self.ws.freeze_panes = coord
+
+    def merge_cells(self, start_row, start_column, end_row, end_column):
+        self.ws.merged_cells.add(CellRange(min_row=start_row, min_col=start_column,
+                                           max_row=end_row, max_col=end_column))
+
+    def add_data_validation(self, dv):
+        self.ws.data_validations.append(dv)
+
+    def flush(self):
+        cells = self.cells
+        ncols = max(c for _, c in cells)
+        for r in range(1, max(r for r, _ in cells) + 1):
+            self.ws.append([cells.get((r, c)) for c in range(1, ncols + 1)])
+
+class Rows:
+    """Row numbers one tab publishes for formulas on later tabs"""
+
+    __slots__ = ("ks_start",
+                 # Segment_Revenue / Segment_PL
+                 "gs_total", "cloud_rev", "ob_rev", "total_rev", "ad_total",
+                 "sum_seg", "consol_ebit_link",
+                 # Consolidated_PL
+                 "rev_pl", "cogs_pl", "ebit_pl", "ni_pl", "da_pl", "sbc_pl",
+                 "shares_pl", "eps_pl",
+                 # BS / Cash_Flow
+                 "total_assets", "equity", "cfo", "capex_cf", "fcf", "end_cash")
+
+class SharedFormula(ArrayFormula):
+    """<f t="shared">: the anchor carries text + ref, dependents only si.
+
+    openpyxl writes ArrayFormula attributes verbatim and skips the text
+    when it is None, so only the attribute set differs.
+    """
+
+    t = "shared"
+
+    def __init__(self, si, ref=None, text=None):
+        super().__init__(ref, text)
+        self.si = si
+
+    def __iter__(self):
+        yield "t", self.t
+        if self.ref:
+            yield "ref", self.ref
+        yield "si", str(self.si)
+
+def _styled(c, *, font=None, fill=None, fmt=None, align=None, border=BD):
+    """Style a fresh cell; every cell shares the one BD border by default"""
+    c.border = border
+    if font: c.font = font
+    if fill: c.fill = fill
+    if fmt: c.number_format = fmt
+    if align: c.alignment = align
+    return c
+
+def heading(ws, title, subtitle=None):
+    """Tab title in A1, optional grey subtitle in A2"""
+    ws.cell(row=1, column=1, value=title).font = FT
+    if subtitle:
+        ws.cell(row=2, column=1, value=subtitle).font = FSM
+
+def row_label(ws, r, text, style="bold"):
+    """Column-A row label; style is one of "bold" / "body" / "small" """
+    ws.cell(row=r, column=1, value=text).style = style
+
+def band(ws, r, text, style="key", ncols=9):
+    """Total row: label plus a "key" / "subtotal" / "err" band over cols 1..ncols.
+
+    Call before writing the row's values; they keep the band's fill and font.
+    """
+    _cell = ws.cell
+    _cell(row=r, column=1, value=text).style = style
+    for c in range(2, ncols+1):
+        _cell(row=r, column=c).style = style
 
-def sb(ws, r1, c1, r2, c2, fill=None, font=None, fmt=None):
-    for r in range(r1, r2+1):
-        for c in range(c1, c2+1):
-            cell = ws.cell(row=r, column=c); cell.border = BD
-            if fill: cell.fill = fill
-            if font: cell.font = font
-            if fmt: cell.number_format = fmt
+def col_sum(rows):
+    """Bound template for "=<col>r1+<col>r2+..."; call it with a column letter"""
+    return ("=" + "+".join(f"{{0}}{x}" for x in rows)).format
 
 def cw(ws, d):
-    for k, v in d.items(): ws.column_dimensions[k].width = v
+    cd = ws.column_dimensions; sheet = cd.worksheet
+    for k, v in d.items(): cd[k] = ColumnDimension(sheet, index=k, width=v)
+
+def hdr_row(ws, row, labels, col=1):
+    """Header cells left to right from col"""
+    _cell = ws.cell
+    for c, h in enumerate(labels, col):
+        _cell(row=row, column=c, value=h).style = "hdr"
 
 def yh(ws, row, labels=None, ncols=9):
-    labels = labels or YR
-    for i, yr in enumerate(labels):
-        c = ws.cell(row=row, column=2+i, value=yr)
-        c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-    ws.cell(row=row, column=1).fill = HDR; ws.cell(row=row, column=1).border = BD
-    n = ws.cell(row=row, column=NCOL, value="Notes / 预测逻辑")
-    n.font = FW; n.fill = HDR; n.alignment = CT; n.border = BD
+    hdr_row(ws, row, labels or YR, col=2)
+    _styled(ws.cell(row=row, column=1), fill=HDR)
+    ws.cell(row=row, column=NCOL, value="Notes / 预测逻辑").style = "hdr"
 
 def sec(ws, r, label, ncols=11):
-    ws.cell(row=r, column=1, value=label).font = FS
+    # Fill comes from the top-left cell, but Excel draws a merged band's
+    # borders from every member cell, so all of them take the section style.
     ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=ncols)
-    for c in range(1, ncols+1):
-        ws.cell(row=r, column=c).fill = SUB; ws.cell(row=r, column=c).border = BD
+    _cell = ws.cell
+    _cell(row=r, column=1, value=label).style = "section_label"
+    for c in range(2, ncols+1):
+        _cell(row=r, column=c).style = "section"
 
 def note(ws, r, text):
     # Prevent text starting with '=' being treated as formula by openpyxl
     if text and text.startswith('='):
         text = text[1:]  # strip leading '='
-    c = ws.cell(row=r, column=NCOL, value=text)
-    c.font = FNOTE; c.alignment = LT; c.border = BD
+    ws.cell(row=r, column=NCOL, value=text).style = "note"
 
-def pct_row(ws, r, num_r, den_r, ncols=9):
-    ws.cell(row=r, column=1).border = BD
-    for c in range(2, ncols+1):
-        ws.cell(row=r, column=c, value=f"={CL(c)}{num_r}/{CL(c)}{den_r}").number_format = NP
-        ws.cell(row=r, column=c).border = BD; ws.cell(row=r, column=c).font = FSM
+def shared_row(ws, r, c1, c2, formula, put):
+    """Formula written for column c1 and filled right to c2 as one shared formula"""
+    si = ws.n_shared; ws.n_shared += 1
+    put(ws, r, c1, SharedFormula(si, f"{COL[c1]}{r}:{COL[c2]}{r}", formula))
+    for c in range(c1+1, c2+1):
+        put(ws, r, c, SharedFormula(si))
 
-def hval(ws, r, col, val, fmt=NI):
+def pct_row(ws, r, num_r, den_r, ncols=9):
+    """num_r/den_r for cols B..ncols; the caller labels column A"""
+    shared_row(ws, r, 2, ncols, f"=B{num_r}/B{den_r}", pval)
+
+def yoy_row(ws, r, base_r, label="  yoy %", ncols=9):
+    """YoY % of row base_r for cols C..ncols (first year has no prior)"""
+    row_label(ws, r, label, "small")
+    shared_row(ws, r, 3, ncols, f"=C{base_r}/B{base_r}-1", pval)
+
+def _role(c, style, fmt, font, style_fmt, style_font):
+    """Named style for a fresh cell, plus any fmt/font it doesn't cover.
+
+    A cell that band() has already styled keeps its fill (and font, unless
+    one is given) and only takes the format and border.
+    """
+    if c.has_style:
+        _styled(c, font=font, fmt=fmt)
+        return
+    c.style = style
+    if fmt != style_fmt: c.number_format = fmt
+    if font is not style_font: c.font = font
+
+def hval(ws, r, col, val, fmt=NI, font=FH):
     """Write historical value with blue font"""
-    c = ws.cell(row=r, column=col, value=val)
-    c.number_format = fmt; c.font = FH; c.border = BD
-
-def fval(ws, r, col, formula, fmt=NI):
-    """Write formula value"""
-    c = ws.cell(row=r, column=col, value=formula)
-    c.number_format = fmt; c.border = BD
-
-def lval(ws, r, col, formula, fmt=NI):
+    _role(ws.cell(row=r, column=col, value=val), "hval", fmt, font, NI, FH)
+
+def hval_row(ws, r, vals, col=2, fmt=NI):
+    """Historical values left to right from col (2023A-2025A by default)"""
+    _cell = ws.cell
+    for c, v in enumerate(vals, col):
+        _role(_cell(row=r, column=c, value=v), "hval", fmt, FH, NI, FH)
+
+def fval(ws, r, col, formula, fmt=NI, font=None):
+    """Write formula value; formats with their own calc style skip the override"""
+    style = CALC_FMT.get(fmt)
+    _role(ws.cell(row=r, column=col, value=formula), style or "calc", fmt, font,
+          fmt if style else NI, None)
+
+def pval(ws, r, col, formula, font=FSM):
+    """Write percentage formula, small font unless font is given"""
+    style, style_font = ("pct_sm", FSM) if font is FSM else ("pct", None)
+    _role(ws.cell(row=r, column=col, value=formula), style, NP, font, NP, style_font)
+
+def lval(ws, r, col, formula, fmt=NI, font=FL):
     """Write link from other sheet with green font"""
-    c = ws.cell(row=r, column=col, value=formula)
-    c.number_format = fmt; c.font = FL; c.border = BD
+    _role(ws.cell(row=r, column=col, value=formula), "link", fmt, font, NI, FL)
 
 def arow(ws, r, label, h23, h24, h25, base, bull, bear, fmt=NP, nt=""):
-    """Assumption row: historical + Base/Bull/Bear + CHOOSE"""
-    ws.cell(row=r, column=1, value=label).font = FB; ws.cell(row=r, column=1).border = BD
-    for ci, v in [(2,h23),(3,h24),(4,h25)]:
-        c = ws.cell(row=r, column=ci, value=v)
-        c.fill = GREY; c.font = FH; c.number_format = fmt; c.border = BD
-    for ci, v in [(6,base),(7,bull),(8,bear)]:
-        c = ws.cell(row=r, column=ci, value=v)
-        c.fill = BLUE; c.font = FI; c.number_format = fmt; c.border = BD
-    sel = ws.cell(row=r, column=9,
-                  value=f'=CHOOSE(MATCH($B$2,{{"Base","Bull","Bear"}},0),F{r},G{r},H{r})')
-    sel.number_format = fmt; sel.border = BD; sel.font = FB
+    """Assumption row: historical + Base/Bull/Bear + INDEX(SCEN_IDX)"""
+    _cell = ws.cell
+    _cell(row=r, column=1, value=label).style = "bold"
+    for ci, v in ((2, h23), (3, h24), (4, h25)):
+        c = _cell(row=r, column=ci, value=v); c.style = "hist"; c.number_format = fmt
+    for ci, v in ((6, base), (7, bull), (8, bear)):
+        c = _cell(row=r, column=ci, value=v); c.style = "input"; c.number_format = fmt
+    sel = _cell(row=r, column=9, value=f"=INDEX(F{r}:H{r},SCEN_IDX)")
+    sel.style = "select"; sel.number_format = fmt
     if nt: note(ws, r, nt)
 
+_FLEGH = Font(bold=True, size=9, color="808080")
+# (font, text) per legend line; None marks the spacer row between blocks
+LEGEND_LINES = (
+    (_FLEGH, "数据图例 Data Legend:"),
+    (FNOTE, "  蓝色字体 Blue Font = 财报原始数据 Hardcoded from financials"),
+    (FNOTE, "  绿色字体 Green Font = 链接自其他工作表 Links from other sheets"),
+    (FNOTE, "  蓝底深蓝字体 Blue Fill = 可编辑假设 Editable assumption inputs"),
+    (FNOTE, "  黄底粗体 Yellow Fill = 关键输出 Key output rows"),
+    (FNOTE, "  黑色字体 Black Font = 公式计算 Calculated from formulas"),
+    None,
+    (_FLEGH, "数据来源 Data Sources:"),
+    (FNOTE, "  • Alphabet 2025 10-K Annual Report (filed Feb 4, 2026) - Consolidated Financial Statements pp.48-52"),
+    (FNOTE, "  • Alphabet 2025 10-K Note 15: Segment Information (Google Services, Cloud, Other Bets)"),
+    (FNOTE, "  • Q4 2025 Earnings Call (Feb 4, 2026): CapEx 2026 guidance $75B (single quarter) → annualized ~$180B"),
+    (FNOTE, "  • 10Y UST yield ~4.2% (Feb 2026), Fed 2% long-term inflation target"),
+)
+
+
 def add_legend(ws, row):
     """Add data legend and sources at bottom of sheet"""
-    ws.cell(row=row, column=1, value="数据图例 Data Legend:").font = Font(bold=True, size=9, color="808080")
-    ws.cell(row=row+1, column=1, value="  蓝色字体 Blue Font = 财报原始数据 Hardcoded from financials").font = FNOTE
-    ws.cell(row=row+2, column=1, value="  绿色字体 Green Font = 链接自其他工作表 Links from other sheets").font = FNOTE
-    ws.cell(row=row+3, column=1, value="  蓝底深蓝字体 Blue Fill = 可编辑假设 Editable assumption inputs").font = FNOTE
-    ws.cell(row=row+4, column=1, value="  黄底粗体 Yellow Fill = 关键输出 Key output rows").font = FNOTE
-    ws.cell(row=row+5, column=1, value="  黑色字体 Black Font = 公式计算 Calculated from formulas").font = FNOTE
-    ws.cell(row=row+7, column=1,
-            value="数据来源 Data Sources:").font = Font(bold=True, size=9, color="808080")
-    ws.cell(row=row+8, column=1,
-            value="  • Alphabet 2025 10-K Annual Report (filed Feb 4, 2026) - Consolidated Financial Statements pp.48-52").font = FNOTE
-    ws.cell(row=row+9, column=1,
-            value="  • Alphabet 2025 10-K Note 15: Segment Information (Google Services, Cloud, Other Bets)").font = FNOTE
-    ws.cell(row=row+10, column=1,
-            value="  • Q4 2025 Earnings Call (Feb 4, 2026): CapEx 2026 guidance $75B (single quarter) → annualized ~$180B").font = FNOTE
-    ws.cell(row=row+11, column=1,
-            value="  • 10Y UST yield ~4.2% (Feb 2026), Fed 2% long-term inflation target").font = FNOTE
+    _cell = ws.cell
+    for r, line in enumerate(LEGEND_LINES, row):
+        if line:
+            _cell(row=r, column=1, value=line[1]).font = line[0]
 
 
 def build():
-    wb = Workbook()
-    R = {}  # cross-tab row references
+    wb = Workbook(write_only=True)
+    R = Rows()  # cross-tab row references
+    tabs = {}  # title -> SheetBuf still open for writes
+
+    for st in (HIST_STYLE, INPUT_STYLE, SELECT_STYLE, SEC_STYLE, SECL_STYLE,
+               HDR_STYLE, NOTE_STYLE, HVAL_STYLE, LINK_STYLE, ASIDE_STYLE, AXIS_STYLE,
+               *CALC_STYLES,
+               *LABEL_STYLES, *BAND_STYLES, *PCT_STYLES):
+        wb.add_named_style(st)
+    # Scenario switch Assumptions!B2 → 1/2/3 (Base/Bull/Bear), shared by every CHOOSE/INDEX
+    wb.defined_names.add(DefinedName("SCEN_IDX",
+                                     attr_text='MATCH(Assumptions!$B$2,{"Base","Bull","Bear"},0)'))
+
+    def new_tab(title):
+        tabs[title] = SheetBuf(wb, title)
+        return tabs[title]
+
+    def stream(*titles):
+        """Flush finished tabs to disk; a late back-fill into one is a KeyError"""
+        for title in titles:
+            tabs.pop(title).flush()
 
     # ═══════════════════════════════════════════════════
     #  TAB 1: COVER
     # ═══════════════════════════════════════════════════
-    ws = wb.active; ws.title = "Cover"
-    ws["A1"] = "Alphabet Inc. (GOOG/GOOGL)"; ws["A1"].font = Font(size=20, bold=True)
-    ws["A2"] = "Segment-Driven DCF Model  |  v5  |  2026-02-10"; ws["A2"].font = Font(size=12, italic=True, color="1F4E78")
-    info = [
+    ws = new_tab("Cover")
+    ws.cell(row=1, column=1, value="Alphabet Inc. (GOOG/GOOGL)").font = Font(size=20, bold=True)
+    ws.cell(row=2, column=1, value="Segment-Driven DCF Model  |  v5  |  2026-02-10").font = Font(size=12, italic=True, color="1F4E78")
+    info = (
         (4, "数据来源 Data Sources", "Alphabet 2025 10-K + Q4'25 Earnings Call + FRED"),
         (5, "CapEx 2026 指引", "$75B/quarter → annualized ~$180B (earnings call 2026-02-04)"),
         (6, "模型特色 Key Feature", "11-Tab model: 三表联动 (PL + BS + CF) + Segment P&L 交叉验证"),
@@ -273,37 +529,37 @@ def build():
         (14, "Step 5", "Check BS balance check row: Total Assets = Total L&E"),
         (15, "Step 6", "Every assumption shows HISTORICAL values (2023-2025) for reference"),
         (16, "Step 7", "Notes column (col J) explains prediction logic for every row"),
-    ]
+    )
+    _cell = ws.cell
     for r, a, b in info:
-        ws.cell(row=r, column=1, value=a).font = FB
-        if b: ws.cell(row=r, column=2, value=b)
+        _cell(row=r, column=1, value=a).font = FB
+        if b: _cell(row=r, column=2, value=b)
     cw(ws, {"A": 28, "B": 90})
+    stream("Cover")
 
     # ═══════════════════════════════════════════════════
     #  TAB 2: KEY SUMMARY (NEW)
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Key_Summary")
-    ws["A1"] = "Alphabet Inc. (GOOG) - 财务摘要 Executive Summary"; ws["A1"].font = FT
-    ws["A2"] = "单位：百万美元（USD Million）"; ws["A2"].font = FSM
+    ws = new_tab("Key_Summary")
+    heading(ws, "Alphabet Inc. (GOOG) - 财务摘要 Executive Summary", "单位：百万美元（USD Million）")
     cw(ws, {"A": 38, "B": 14, "C": 14, "D": 14, "E": 14, "F": 14, "G": 14, "H": 38})
     # We'll fill this after building other tabs so we can link
     # Store starting row for later fill
-    R["ks_start"] = 4
+    R.ks_start = 4
 
     # ═══════════════════════════════════════════════════
     #  TAB 3: ASSUMPTIONS
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Assumptions")
+    ws = new_tab("Assumptions")
     cw(ws, {"A": 44, "B": 14, "C": 14, "D": 14, "E": 3, "F": 14, "G": 14, "H": 14, "I": 14, "J": 14, "K": 40})
 
-    ws["A1"] = "Assumptions & Drivers 假设与驱动"; ws["A1"].font = FT
-    ws["A2"] = "Scenario 情景"; ws["B2"] = "Base"; ws["B2"].fill = BLUE; ws["B2"].font = FI
+    heading(ws, "Assumptions & Drivers 假设与驱动")
+    ws["A2"] = "Scenario 情景"
+    c = ws.cell(row=2, column=2, value="Base"); c.fill = BLUE; c.font = FI
     dv = DataValidation(type="list", formula1='"Base,Bull,Bear"', allow_blank=False)
-    ws.add_data_validation(dv); dv.add(ws["B2"])
+    ws.add_data_validation(dv); dv.add("B2")
 
-    for i, h in enumerate(["Parameter 参数", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes / 预测逻辑"]):
-        c = ws.cell(row=4, column=1+i, value=h)
-        c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
+    hdr_row(ws, 4, ["Parameter 参数", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes / 预测逻辑"])
 
     # ── WACC ──
     sec(ws, 6, "WACC 加权平均资本成本参数")
@@ -319,8 +575,8 @@ def build():
     for r, lbl, f in [(16, "Ke = Rf + Beta × ERP 股权成本", "=I7+I8*I9"),
                        (17, "After-tax Kd 税后债务成本", "=I10*(1-I11)"),
                        (18, "WACC 加权平均资本成本", "=(1-I12)*I16+I12*I17")]:
-        ws.cell(row=r, column=1, value=lbl).font = FB; ws.cell(row=r, column=1).border = BD
-        c = ws.cell(row=r, column=9, value=f); c.number_format = NP2; c.border = BD
+        row_label(ws, r, lbl)
+        c = _styled(ws.cell(row=r, column=9, value=f), fmt=NP2)
         if r == 18: c.fill = KEY; c.font = FB
 
     # ── Valuation Bridge ──
@@ -334,50 +590,40 @@ def build():
     seg_names = list(SEG_REV.keys())
     for i, yr in enumerate(["2023A", "2024A", "2025A", "", "2026E", "2027E", "2028E", "2029E", "2030E"]):
         c = ws.cell(row=26, column=2+i, value=yr if yr else "")
-        if yr: c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-    ws.cell(row=26, column=1, value="Segment").font = FW; ws.cell(row=26, column=1).fill = HDR; ws.cell(row=26, column=1).border = BD
-
-    base_g = [[.12,.10,.09,.08,.07],[.14,.12,.10,.09,.08],[-.02,-.02,-.01,-.01,0],
-              [.18,.15,.13,.11,.09],[.30,.25,.22,.18,.15],[.10,.15,.15,.15,.10]]
-    bull_g = [[.15,.13,.11,.10,.09],[.18,.15,.13,.11,.10],[-.01,0,0,.01,.01],
-              [.22,.18,.15,.13,.11],[.38,.30,.25,.20,.17],[.15,.20,.20,.20,.15]]
-    bear_g = [[.08,.07,.06,.05,.04],[.08,.07,.06,.05,.04],[-.05,-.04,-.03,-.03,-.02],
-              [.12,.10,.09,.08,.07],[.22,.18,.15,.12,.10],[0,.05,.05,.05,.05]]
+        if yr: c.style = "hdr"
+    _styled(ws.cell(row=26, column=1, value="Segment"), font=FW, fill=HDR)
 
+    _cell = ws.cell
     seg_base_rows = {}
     seg_notes = ["搜索广告核心引擎", "AI-driven Shorts增长", "持续缩减", "YouTube Premium/硬件增长",
                  "AI Cloud高增长引擎", "Waymo等前沿业务"]
     for idx, name in enumerate(seg_names):
         r = 27 + idx; seg_base_rows[name] = r
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
-        hist = SEG_REV[name]
-        for j in [1,2]:
-            g = hist[j]/hist[j-1]-1
-            hval(ws, r, 2+j, g, NP)
-        for j, v in enumerate(base_g[idx]):
-            c = ws.cell(row=r, column=6+j, value=v); c.fill = BLUE; c.font = FI; c.number_format = NP; c.border = BD
+        row_label(ws, r, name)
+        hval_row(ws, r, SEG_REV_G[name], col=3, fmt=NP)
+        for j, v in enumerate(BASE_G[idx]):
+            c = _cell(row=r, column=6+j, value=v); c.style = "input"; c.number_format = NP
         note(ws, r, seg_notes[idx])
 
     sec(ws, 34, "Revenue Growth - Bull Case 乐观情景")
     seg_bull_rows = {}
     for idx, name in enumerate(seg_names):
         r = 35 + idx; seg_bull_rows[name] = r
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(bull_g[idx]):
-            c = ws.cell(row=r, column=6+j, value=v); c.fill = BLUE; c.font = FI; c.number_format = NP; c.border = BD
+        row_label(ws, r, name)
+        for j, v in enumerate(BULL_G[idx]):
+            c = _cell(row=r, column=6+j, value=v); c.style = "input"; c.number_format = NP
 
     sec(ws, 42, "Revenue Growth - Bear Case 悲观情景")
     seg_bear_rows = {}
     for idx, name in enumerate(seg_names):
         r = 43 + idx; seg_bear_rows[name] = r
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(bear_g[idx]):
-            c = ws.cell(row=r, column=6+j, value=v); c.fill = BLUE; c.font = FI; c.number_format = NP; c.border = BD
+        row_label(ws, r, name)
+        for j, v in enumerate(BEAR_G[idx]):
+            c = _cell(row=r, column=6+j, value=v); c.style = "input"; c.number_format = NP
 
     # ── Segment Cost Structure ──
     sec(ws, 50, "Segment Cost Structure 分部成本结构 (with Historical)")
-    for i, h in enumerate(["Cost Item 成本项", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"]):
-        c = ws.cell(row=51, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
+    hdr_row(ws, 51, ["Cost Item 成本项", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"])
     arow(ws, 52, "Services: Emp Comp % 员工薪酬占比", .170, .146, .132, .128, .125, .135, NP, "薪酬含SBC+福利，Note15")
     arow(ws, 53, "Services: Other Costs % 其他费用占比", .479, .456, .461, .455, .448, .468, NP, "含TAC/内容采购/基础设施")
     arow(ws, 54, "Cloud: Emp Comp % 员工薪酬占比", .576, .475, .376, .340, .330, .360, NP, "Cloud人效持续改善")
@@ -387,8 +633,7 @@ def build():
 
     # ── Consolidated Cost ──
     sec(ws, 59, "Consolidated Cost Structure 合并成本率")
-    for i, h in enumerate(["Cost Item", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"]):
-        c = ws.cell(row=60, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
+    hdr_row(ws, 60, ["Cost Item", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"])
     arow(ws, 61, "TAC Rate 流量获取成本率 (% Ad Rev)", .207, .207, .203, .200, .198, .208, NP, "支付给合作伙伴的分成")
     arow(ws, 62, "Other COGS 其他营业成本 (% Total Rev)", .273, .261, .255, .250, .245, .260, NP, "基础设施折旧/内容/数据中心")
     arow(ws, 63, "R&D 研发费用 (% Total Rev)", .148, .141, .152, .145, .140, .155, NP, "AI投入持续，但规模效应显现")
@@ -400,15 +645,14 @@ def build():
 
     # ── CapEx ──
     sec(ws, 70, "CapEx 资本支出 (USD mm) - 2026 per mgmt guidance ~$180B")
-    for i, h in enumerate(["Year", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"]):
-        c = ws.cell(row=71, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-    capex_data = [
+    hdr_row(ws, 71, ["Year", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"])
+    capex_data = (
         (72, "2026E CapEx", 32251, 52535, 91447, 180000, 185000, 175000, "Q4'25 Earnings: $75B/Q → ~$180B/yr"),
         (73, "2027E CapEx", None, None, None, 160000, 170000, 155000, "AI投资高峰后逐步回落"),
         (74, "2028E CapEx", None, None, None, 140000, 150000, 135000, "资本密集度开始降低"),
         (75, "2029E CapEx", None, None, None, 120000, 130000, 115000, "CapEx周期转为维护型"),
         (76, "2030E CapEx", None, None, None, 105000, 115000, 100000, "稳态CapEx水平"),
-    ]
+    )
     capex_rows = []
     for r_num, label, h23, h24, h25, base, bull, bear, nt in capex_data:
         arow(ws, r_num, label, h23, h24, h25, base, bull, bear, NI, nt)
@@ -421,8 +665,7 @@ def build():
 
     # ── BS Assumptions (NEW) ──
     sec(ws, 82, "Balance Sheet Assumptions 资产负债表假设")
-    for i, h in enumerate(["Item", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"]):
-        c = ws.cell(row=83, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
+    hdr_row(ws, 83, ["Item", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"])
     arow(ws, 84, "AR Days 应收账款周转天数", 47.8, 54.6, 57.0, 55, 53, 58, "0.0", "AR/Revenue×365")
     arow(ws, 85, "AP Days 应付账款周转天数 (of COGS)", 19.4, 19.9, 27.4, 26, 27, 24, "0.0", "AP/COGS×365")
     arow(ws, 86, "AccComp 应计薪酬 (% Rev)", .046, .043, .044, .043, .042, .045, NP, "员工薪酬应计占收入比")
@@ -436,39 +679,57 @@ def build():
 
     # ── Debt & Financing ──
     sec(ws, 95, "Debt & Financing 债务融资 (Net Issuance, USD mm)")
-    for i, h in enumerate(["Year", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"]):
-        c = ws.cell(row=96, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-    debt_data = [
+    hdr_row(ws, 96, ["Year", "2023A", "2024A", "2025A", "", "Base", "Bull", "Bear", "Selected", "", "Notes"])
+    debt_data = (
         (97,  "2026E Net Debt Issuance 净融资", -760, 888, 32137, 60000, 55000, 65000, "CapEx高峰需大量融资,参照2025发债$65B"),
         (98,  "2027E Net Debt Issuance", None, None, None, 25000, 20000, 30000, "CapEx缓降,融资需求下降"),
         (99,  "2028E Net Debt Issuance", None, None, None, 10000, 5000, 15000, "接近自给自足"),
         (100, "2029E Net Debt Issuance", None, None, None, -10000, -15000, 0, "开始偿债"),
         (101, "2030E Net Debt Issuance", None, None, None, -20000, -25000, -10000, "积极去杠杆"),
-    ]
+    )
     debt_rows = []
     for r_num, label, h23, h24, h25, base, bull, bear, nt in debt_data:
         arow(ws, r_num, label, h23, h24, h25, base, bull, bear, NI, nt)
         debt_rows.append(r_num)
 
+    # Selected (col I) values read by other tabs, as workbook-level names
+    capex_names = [f"capex_{2026+i}" for i in range(5)]
+    debt_names = [f"net_debt_{2026+i}" for i in range(5)]
+    sel_names = ((11, "tax_rate"), (13, "tv_growth"), (18, "wacc"),
+                 (21, "cash_sec"), (22, "total_debt"), (23, "dil_shares"),
+                 (52, "svc_emp_pct"), (53, "svc_oth_pct"), (54, "cld_emp_pct"), (55, "cld_oth_pct"),
+                 (56, "ob_margin"), (57, "alpha_costs"),
+                 (61, "tac_rate"), (62, "ocogs_pct"), (63, "rd_pct"), (64, "sm_pct"), (65, "ga_pct"),
+                 (66, "da_pct"), (67, "sbc_pct"), (68, "nwc_pct"),
+                 (79, "buyback"), (80, "div_ps"),
+                 (84, "ar_days"), (85, "ap_days"), (86, "acccomp_pct"), (87, "accexp_pct"),
+                 (88, "revshare_pct"), (89, "defrev_g"), (90, "oplease_g"), (91, "nonmkt_g"),
+                 (92, "mktsec_g"), (93, "stocknet_pct"),
+                 *zip(capex_rows, capex_names), *zip(debt_rows, debt_names))
+    for row, name in sel_names:
+        wb.defined_names.add(DefinedName(name, attr_text=f"Assumptions!$I${row}"))
+
     ws.freeze_panes = "B5"
     add_legend(ws, 105)
+    stream("Assumptions")
 
     # ═══════════════════════════════════════════════════
     #  TAB 4: SEGMENT REVENUE
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Segment_Revenue")
-    ws["A1"] = "Revenue Build 分部收入构建 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "单位：百万美元 | Cloud Q4'25 = $17.7B (48% YoY)"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (40 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
+    ws = new_tab("Segment_Revenue")
+    heading(ws, "Revenue Build 分部收入构建 (USD mm)", "单位：百万美元 | Cloud Q4'25 = $17.7B (48% YoY)")
+    cw(ws, {COL[c]: (40 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
     yh(ws, 4)
 
-    def gf(seg_idx, yr_j):
-        """CHOOSE formula for growth from 3 scenario blocks"""
-        yc = CL(6+yr_j)
-        br = seg_base_rows[seg_names[seg_idx]]
-        bur = seg_bull_rows[seg_names[seg_idx]]
-        ber = seg_bear_rows[seg_names[seg_idx]]
-        return f'CHOOSE(MATCH(Assumptions!$B$2,{{"Base","Bull","Bear"}},0),Assumptions!{yc}${br},Assumptions!{yc}${bur},Assumptions!{yc}${ber})'
+    def seg_forecast(r, seg_idx):
+        """2026E-2030E: prior year x (1 + CHOOSE growth from the 3 scenario blocks)"""
+        name = seg_names[seg_idx]
+        br, bur, ber = seg_base_rows[name], seg_bull_rows[name], seg_bear_rows[name]
+        # row-constant parts baked in once; only the two column letters vary
+        tmpl = (f"={{0}}{r}*(1+CHOOSE(SCEN_IDX,Assumptions!{{1}}${br},"
+                f"Assumptions!{{1}}${bur},Assumptions!{{1}}${ber}))").format
+        for pc in range(5, 10):
+            fval(ws, r, pc, tmpl(COL[pc-1], COL[pc+1]))
 
     r = 6
     # Google Advertising
@@ -484,109 +745,75 @@ def build():
     }
     for seg_idx in range(3):
         name = seg_names[seg_idx]
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
+        row_label(ws, r, name)
         rev_rows[name] = r
-        for j, v in enumerate(SEG_REV[name]):
-            hval(ws, r, 2+j, v)
-        for yr_j in range(5):
-            pc = 5+yr_j; prev = "D" if yr_j == 0 else CL(pc-1)
-            fval(ws, r, pc, f"={prev}{r}*(1+{gf(seg_idx, yr_j)})")
+        hval_row(ws, r, SEG_REV[name])
+        seg_forecast(r, seg_idx)
         note(ws, r, seg_notes_rev[name])
         r += 1
         # yoy
-        ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-        for j in [1,2]:
-            fval(ws, r, 2+j, f"={CL(2+j)}{r-1}/{CL(1+j)}{r-1}-1", NP)
-            ws.cell(row=r, column=2+j).font = FSM
-        for yr_j in range(5):
-            pc = 5+yr_j
-            fval(ws, r, pc, f"={CL(pc)}{r-1}/{CL(pc-1)}{r-1}-1", NP)
-            ws.cell(row=r, column=pc).font = FSM
+        yoy_row(ws, r, r-1)
         r += 1
 
     ad_total_r = r
-    ws.cell(row=r, column=1, value="Total Google Advertising 广告合计").font = FB
-    sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "Total Google Advertising 广告合计", "subtotal")
+    tot = col_sum(rev_rows[n] for n in seg_names[:3])
     for c in range(2, 10):
-        parts = "+".join(f"{CL(c)}{rev_rows[n]}" for n in seg_names[:3])
-        fval(ws, r, c, f"={parts}")
+        fval(ws, r, c, tot(COL[c]))
     note(ws, r, "=Search+YouTube+Network")
     r += 2
 
     # Subs
     sec(ws, r, "Subscriptions, Platforms & Devices 订阅/平台/设备"); r += 1
     name = seg_names[3]
-    ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, name)
     rev_rows[name] = r
-    for j, v in enumerate(SEG_REV[name]):
-        hval(ws, r, 2+j, v)
-    for yr_j in range(5):
-        pc = 5+yr_j; prev = "D" if yr_j == 0 else CL(pc-1)
-        fval(ws, r, pc, f"={prev}{r}*(1+{gf(3, yr_j)})")
+    hval_row(ws, r, SEG_REV[name])
+    seg_forecast(r, 3)
     note(ws, r, seg_notes_rev[name])
     r += 1
-    ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in [1,2]:
-        fval(ws, r, 2+j, f"={CL(2+j)}{r-1}/{CL(1+j)}{r-1}-1", NP); ws.cell(row=r, column=2+j).font = FSM
-    for yr_j in range(5):
-        pc=5+yr_j; fval(ws, r, pc, f"={CL(pc)}{r-1}/{CL(pc-1)}{r-1}-1", NP); ws.cell(row=r, column=pc).font = FSM
+    yoy_row(ws, r, r-1)
     r += 2
 
     # Google Services Total
     gs_total_r = r
-    ws.cell(row=r, column=1, value="Google Services Total 谷歌服务合计").font = FB
-    sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "Google Services Total 谷歌服务合计", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{ad_total_r}+{CL(c)}{rev_rows[seg_names[3]]}")
+        fval(ws, r, c, f"={COL[c]}{ad_total_r}+{COL[c]}{rev_rows[seg_names[3]]}")
     note(ws, r, "=广告合计+订阅/平台/设备")
-    R["gs_total"] = gs_total_r
+    R.gs_total = gs_total_r
     r += 2
 
     # Cloud
     sec(ws, r, "Google Cloud 谷歌云"); r += 1
     name = seg_names[4]
-    ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, name)
     rev_rows[name] = r
-    for j, v in enumerate(SEG_REV[name]):
-        hval(ws, r, 2+j, v)
-    for yr_j in range(5):
-        pc = 5+yr_j; prev = "D" if yr_j == 0 else CL(pc-1)
-        fval(ws, r, pc, f"={prev}{r}*(1+{gf(4, yr_j)})")
+    hval_row(ws, r, SEG_REV[name])
+    seg_forecast(r, 4)
     note(ws, r, seg_notes_rev[name])
-    R["cloud_rev"] = r
+    R.cloud_rev = r
     r += 1
-    ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in [1,2]:
-        fval(ws, r, 2+j, f"={CL(2+j)}{r-1}/{CL(1+j)}{r-1}-1", NP); ws.cell(row=r, column=2+j).font = FSM
-    for yr_j in range(5):
-        pc=5+yr_j; fval(ws, r, pc, f"={CL(pc)}{r-1}/{CL(pc-1)}{r-1}-1", NP); ws.cell(row=r, column=pc).font = FSM
+    yoy_row(ws, r, r-1)
     r += 2
 
     # Other Bets
     sec(ws, r, "Other Bets 其他创新业务"); r += 1
     name = seg_names[5]
-    ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, name)
     rev_rows[name] = r
-    for j, v in enumerate(SEG_REV[name]):
-        hval(ws, r, 2+j, v)
-    for yr_j in range(5):
-        pc = 5+yr_j; prev = "D" if yr_j == 0 else CL(pc-1)
-        fval(ws, r, pc, f"={prev}{r}*(1+{gf(5, yr_j)})")
+    hval_row(ws, r, SEG_REV[name])
+    seg_forecast(r, 5)
     note(ws, r, seg_notes_rev[name])
-    R["ob_rev"] = r
+    R.ob_rev = r
     r += 1
-    ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in [1,2]:
-        fval(ws, r, 2+j, f"={CL(2+j)}{r-1}/{CL(1+j)}{r-1}-1", NP); ws.cell(row=r, column=2+j).font = FSM
-    for yr_j in range(5):
-        pc=5+yr_j; fval(ws, r, pc, f"={CL(pc)}{r-1}/{CL(pc-1)}{r-1}-1", NP); ws.cell(row=r, column=pc).font = FSM
+    yoy_row(ws, r, r-1)
     r += 2
 
     # Hedging
     hedge_r = r
-    ws.cell(row=r, column=1, value="Hedging gains (losses) 外汇对冲").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(HEDGE):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Hedging gains (losses) 外汇对冲", "body")
+    hval_row(ws, r, HEDGE)
     for yr_j in range(5):
         fval(ws, r, 5+yr_j, 0)
     note(ws, r, "假设为零 Assume zero")
@@ -594,179 +821,135 @@ def build():
 
     # TOTAL
     total_rev_r = r
-    ws.cell(row=r, column=1, value="Total Revenue 总收入").font = FB
-    sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "Total Revenue 总收入", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{gs_total_r}+{CL(c)}{R['cloud_rev']}+{CL(c)}{R['ob_rev']}+{CL(c)}{hedge_r}")
+        fval(ws, r, c, f"={COL[c]}{gs_total_r}+{COL[c]}{R.cloud_rev}+{COL[c]}{R.ob_rev}+{COL[c]}{hedge_r}")
     note(ws, r, "=Services+Cloud+OtherBets+Hedging")
-    R["total_rev"] = total_rev_r
+    R.total_rev = total_rev_r
     r += 1
-    ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in range(1, 8):
-        fval(ws, r, 2+j, f"={CL(2+j)}{total_rev_r}/{CL(1+j)}{total_rev_r}-1", NP)
-        ws.cell(row=r, column=2+j).font = FSM
+    yoy_row(ws, r, total_rev_r)
     r += 2
 
     # Revenue Mix
     sec(ws, r, "Revenue Mix % 收入结构"); r += 1
     for name in ["Google Search & other", "YouTube ads", "Google Network",
                   "Subs, Platforms & Devices", "Google Cloud", "Other Bets"]:
-        ws.cell(row=r, column=1, value=f"  {name}").font = FSM; ws.cell(row=r, column=1).border = BD
+        row_label(ws, r, f"  {name}", "small")
         for c in range(2, 10):
-            fval(ws, r, c, f"={CL(c)}{rev_rows[name]}/{CL(c)}{total_rev_r}", NP)
-            ws.cell(row=r, column=c).font = FSM
+            pval(ws, r, c, f"={COL[c]}{rev_rows[name]}/{COL[c]}{total_rev_r}")
         r += 1
-    R["ad_total"] = ad_total_r
+    R.ad_total = ad_total_r
 
     ws.freeze_panes = "B5"
     add_legend(ws, r + 2)
+    stream("Segment_Revenue")
 
     # ═══════════════════════════════════════════════════
     #  TAB 5: SEGMENT P&L
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Segment_PL")
-    ws["A1"] = "Segment P&L 分部利润表 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "Revenue / Costs / Operating Income by Division"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
+    ws = new_tab("Segment_PL")
+    heading(ws, "Segment P&L 分部利润表 (USD mm)", "Revenue / Costs / Operating Income by Division")
+    cw(ws, {COL[c]: (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
     yh(ws, 3)
 
     r = 5
-    # ── Google Services ──
-    sec(ws, r, "Google Services 谷歌服务"); r += 1
-    svc_rev_r = r
-    ws.cell(row=r, column=1, value="Revenue 收入").font = FB; ws.cell(row=r, column=1).border = BD
-    for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_Revenue!{CL(c)}{gs_total_r}")
-    note(ws, r, "链接自Segment_Revenue")
-    r += 1
-    svc_emp_r = r
-    ws.cell(row=r, column=1, value="(-) Employee Comp 员工薪酬").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["svc_emp"]):
-        hval(ws, r, 2+j, v)
-    for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{svc_rev_r}*Assumptions!$I$52")
-    note(ws, r, "=Revenue×Emp Comp%, 含SBC+福利 (Note 15)")
-    r += 1
-    svc_oth_r = r
-    ws.cell(row=r, column=1, value="(-) Other Costs 其他费用").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["svc_oth"]):
-        hval(ws, r, 2+j, v)
-    for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{svc_rev_r}*Assumptions!$I$53")
-    note(ws, r, "含TAC/内容采购/基础设施/设备成本")
-    r += 1
-    svc_tc_r = r
-    ws.cell(row=r, column=1, value="Total Costs 总成本").font = FB; ws.cell(row=r, column=1).border = BD
-    for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{svc_emp_r}+{CL(c)}{svc_oth_r}")
-    r += 1
-    svc_oi_r = r
-    ws.cell(row=r, column=1, value="Operating Income 经营利润").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
-    for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{svc_rev_r}-{CL(c)}{svc_tc_r}")
-    note(ws, r, "=Revenue-Total Costs")
-    r += 1
-    ws.cell(row=r, column=1, value="  Op Margin 经营利润率").font = FSM; ws.cell(row=r, column=1).border = BD
-    pct_row(ws, r, svc_oi_r, svc_rev_r)
-    r += 2
-
-    # ── Google Cloud ──
-    sec(ws, r, "Google Cloud 谷歌云"); r += 1
-    cld_rev_r = r
-    ws.cell(row=r, column=1, value="Revenue 收入").font = FB; ws.cell(row=r, column=1).border = BD
-    for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_Revenue!{CL(c)}{R['cloud_rev']}")
-    note(ws, r, "链接自Segment_Revenue")
-    r += 1
-    cld_emp_r = r
-    ws.cell(row=r, column=1, value="(-) Employee Comp 员工薪酬").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["cld_emp"]):
-        hval(ws, r, 2+j, v)
-    for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{cld_rev_r}*Assumptions!$I$54")
-    note(ws, r, "=Revenue×Cloud Emp%, 人效持续改善")
-    r += 1
-    cld_oth_r = r
-    ws.cell(row=r, column=1, value="(-) Other Costs 其他费用").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["cld_oth"]):
-        hval(ws, r, 2+j, v)
-    for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{cld_rev_r}*Assumptions!$I$55")
-    note(ws, r, "含基础设施/第三方服务费")
-    r += 1
-    cld_tc_r = r
-    ws.cell(row=r, column=1, value="Total Costs 总成本").font = FB; ws.cell(row=r, column=1).border = BD
-    for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{cld_emp_r}+{CL(c)}{cld_oth_r}")
-    r += 1
-    cld_oi_r = r
-    ws.cell(row=r, column=1, value="Operating Income 经营利润").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
-    for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{cld_rev_r}-{CL(c)}{cld_tc_r}")
-    note(ws, r, "Cloud利润率快速提升")
-    r += 1
-    ws.cell(row=r, column=1, value="  Op Margin 经营利润率").font = FSM; ws.cell(row=r, column=1).border = BD
-    pct_row(ws, r, cld_oi_r, cld_rev_r)
-    r += 2
+    # ── Google Services / Google Cloud: Revenue - (Emp Comp + Other Costs) ──
+    seg_oi_rows = []
+    for title, src_r, key, emp_nt, oth_nt, oi_nt in (
+        ("Google Services 谷歌服务", gs_total_r, "svc", "=Revenue×Emp Comp%, 含SBC+福利 (Note 15)",
+         "含TAC/内容采购/基础设施/设备成本", "=Revenue-Total Costs"),
+        ("Google Cloud 谷歌云", R.cloud_rev, "cld", "=Revenue×Cloud Emp%, 人效持续改善",
+         "含基础设施/第三方服务费", "Cloud利润率快速提升"),
+    ):
+        sec(ws, r, title); r += 1
+        rev_r = r
+        row_label(ws, r, "Revenue 收入")
+        for c in range(2, 10):
+            lval(ws, r, c, f"=Segment_Revenue!{COL[c]}{src_r}")
+        note(ws, r, "链接自Segment_Revenue")
+        r += 1
+        cost_rows = []
+        for part, label, nt in (("emp", "(-) Employee Comp 员工薪酬", emp_nt),
+                                ("oth", "(-) Other Costs 其他费用", oth_nt)):
+            cost_rows.append(r)
+            row_label(ws, r, label, "body")
+            hval_row(ws, r, SEG_PL[f"{key}_{part}"])
+            for c in range(5, 10):
+                fval(ws, r, c, f"={COL[c]}{rev_r}*{key}_{part}_pct")
+            note(ws, r, nt)
+            r += 1
+        tc_r = r
+        row_label(ws, r, "Total Costs 总成本")
+        tot = col_sum(cost_rows)
+        for c in range(2, 10):
+            fval(ws, r, c, tot(COL[c]))
+        r += 1
+        oi_r = r
+        seg_oi_rows.append(oi_r)
+        band(ws, r, "Operating Income 经营利润", "key")
+        for c in range(2, 10):
+            fval(ws, r, c, f"={COL[c]}{rev_r}-{COL[c]}{tc_r}")
+        note(ws, r, oi_nt)
+        r += 1
+        row_label(ws, r, "  Op Margin 经营利润率", "small")
+        pct_row(ws, r, oi_r, rev_r)
+        r += 2
 
     # ── Other Bets ──
     sec(ws, r, "Other Bets 其他创新业务"); r += 1
     ob_rev_r2 = r
-    ws.cell(row=r, column=1, value="Revenue 收入").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Revenue 收入")
     for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_Revenue!{CL(c)}{R['ob_rev']}")
+        lval(ws, r, c, f"=Segment_Revenue!{COL[c]}{R.ob_rev}")
     r += 1
     ob_oi_r = r
-    ws.cell(row=r, column=1, value="Operating Income (Loss) 经营利润(亏损)").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["ob_oi"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Operating Income (Loss) 经营利润(亏损)")
+    hval_row(ws, r, SEG_PL["ob_oi"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{ob_rev_r2}*Assumptions!$I$56")
+        fval(ws, r, c, f"={COL[c]}{ob_rev_r2}*ob_margin")
     note(ws, r, "=Revenue×OI Margin%, 前沿业务持续亏损")
     r += 1
-    ws.cell(row=r, column=1, value="Implied Costs 隐含成本 (=Rev-OI)").font = FN; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Implied Costs 隐含成本 (=Rev-OI)", "body")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{ob_rev_r2}-{CL(c)}{ob_oi_r}")
+        fval(ws, r, c, f"={COL[c]}{ob_rev_r2}-{COL[c]}{ob_oi_r}")
     r += 1
-    ws.cell(row=r, column=1, value="  Op Margin").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  Op Margin", "small")
     pct_row(ws, r, ob_oi_r, ob_rev_r2)
     r += 2
 
     # ── Alphabet-level ──
     sec(ws, r, "Alphabet-level 未分配(AI研发+企业费用)"); r += 1
     alpha_r = r
-    ws.cell(row=r, column=1, value="Unallocated Costs 未分配费用").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SEG_PL["alpha"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Unallocated Costs 未分配费用")
+    hval_row(ws, r, SEG_PL["alpha"])
     for c in range(5, 10):
-        fval(ws, r, c, f"=-Assumptions!$I$57")
+        fval(ws, r, c, f"=-alpha_costs")
     note(ws, r, "未分配AI研发+企业管理费用")
     r += 1
-    ws.cell(row=r, column=1, value="  % of Total Revenue").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  % of Total Revenue", "small")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{alpha_r}/Segment_Revenue!{CL(c)}{total_rev_r}", NP)
-        ws.cell(row=r, column=c).font = FSM
+        pval(ws, r, c, f"={COL[c]}{alpha_r}/Segment_Revenue!{COL[c]}{total_rev_r}")
     r += 2
 
     # ── Cross-Check ──
     sec(ws, r, "Cross-Check 交叉验证: Sum of Segment OI vs Consolidated EBIT"); r += 1
     sum_seg_r = r
-    R["sum_seg"] = sum_seg_r
-    ws.cell(row=r, column=1, value="Sum of Segment OI 分部OI汇总").font = FB; ws.cell(row=r, column=1).border = BD
+    R.sum_seg = sum_seg_r
+    row_label(ws, r, "Sum of Segment OI 分部OI汇总")
+    tot = col_sum([*seg_oi_rows, ob_oi_r, alpha_r])
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{svc_oi_r}+{CL(c)}{cld_oi_r}+{CL(c)}{ob_oi_r}+{CL(c)}{alpha_r}")
+        fval(ws, r, c, tot(COL[c]))
     note(ws, r, "=Services+Cloud+OtherBets+Alphabet-level")
     r += 1
     consol_ebit_link_r = r
-    R["consol_ebit_link"] = r
-    ws.cell(row=r, column=1, value="Consolidated EBIT (from Consolidated_PL)").font = FB; ws.cell(row=r, column=1).border = BD
+    R.consol_ebit_link = r
+    row_label(ws, r, "Consolidated EBIT (from Consolidated_PL)")
     # Fill after building Consolidated_PL
     r += 1
     diff_r = r
-    ws.cell(row=r, column=1, value="Difference 差异 (should = 0)").font = FB; ws.cell(row=r, column=1).border = BD
+    band(ws, r, "Difference 差异 (should = 0)", "err")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{sum_seg_r}-{CL(c)}{consol_ebit_link_r}")
-    sb(ws, diff_r, 1, diff_r, 9, fill=ERR, font=FB)
+        fval(ws, r, c, f"={COL[c]}{sum_seg_r}-{COL[c]}{consol_ebit_link_r}")
     note(ws, diff_r, "应为0，否则分部与合并口径不一致")
 
     ws.freeze_panes = "B4"
@@ -775,212 +958,197 @@ def build():
     # ═══════════════════════════════════════════════════
     #  TAB 6: CONSOLIDATED P&L
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Consolidated_PL")
-    ws["A1"] = "Consolidated Income Statement 合并利润表 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "Source: 10-K p.49"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
+    ws = new_tab("Consolidated_PL")
+    heading(ws, "Consolidated Income Statement 合并利润表 (USD mm)", "Source: 10-K p.49")
+    cw(ws, {COL[c]: (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
     yh(ws, 3)
 
     r = 5
     rev_pl = r
-    ws.cell(row=r, column=1, value="Total Revenue 总收入").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "Total Revenue 总收入", "key")
     for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_Revenue!{CL(c)}{total_rev_r}")
+        lval(ws, r, c, f"=Segment_Revenue!{COL[c]}{total_rev_r}")
     note(ws, r, "链接自Segment_Revenue")
-    R["rev_pl"] = rev_pl
+    R.rev_pl = rev_pl
     r += 1
-    ws.cell(row=r, column=1, value="  yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in range(1, 8):
-        fval(ws, r, 2+j, f"={CL(2+j)}{rev_pl}/{CL(1+j)}{rev_pl}-1", NP); ws.cell(row=r, column=2+j).font = FSM
+    yoy_row(ws, r, rev_pl)
     r += 1
 
     ad_pl = r
-    ws.cell(row=r, column=1, value="  Google Advertising Rev (memo) 广告收入").font = FN; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  Google Advertising Rev (memo) 广告收入", "body")
     for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_Revenue!{CL(c)}{ad_total_r}")
+        lval(ws, r, c, f"=Segment_Revenue!{COL[c]}{ad_total_r}")
     note(ws, r, "用于计算TAC")
     r += 2
 
     # COGS
     sec(ws, r, "Cost of Revenues 营业成本 (COGS)"); r += 1
     tac_pl = r
-    ws.cell(row=r, column=1, value="  TAC 流量获取成本").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["TAC"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "  TAC 流量获取成本", "body")
+    hval_row(ws, r, PL["TAC"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{ad_pl}*Assumptions!$I$61")
+        fval(ws, r, c, f"={COL[c]}{ad_pl}*tac_rate")
     note(ws, r, "=Ad Revenue×TAC Rate")
     r += 1
-    ws.cell(row=r, column=1, value="    TAC rate (% of Ad Rev)").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "    TAC rate (% of Ad Rev)", "small")
     pct_row(ws, r, tac_pl, ad_pl); r += 1
 
     ocogs_pl = r
-    ws.cell(row=r, column=1, value="  Other Cost of Revenues 其他营业成本").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["OtherCOGS"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "  Other Cost of Revenues 其他营业成本", "body")
+    hval_row(ws, r, PL["OtherCOGS"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{rev_pl}*Assumptions!$I$62")
+        fval(ws, r, c, f"={COL[c]}{rev_pl}*ocogs_pct")
     note(ws, r, "基础设施折旧/内容/数据中心运营")
     r += 1
-    ws.cell(row=r, column=1, value="    Other COGS %").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "    Other COGS %", "small")
     pct_row(ws, r, ocogs_pl, rev_pl); r += 1
 
     cogs_pl = r
-    ws.cell(row=r, column=1, value="Total COGS 营业成本合计").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Total COGS 营业成本合计")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{tac_pl}+{CL(c)}{ocogs_pl}")
-    R["cogs_pl"] = cogs_pl
+        fval(ws, r, c, f"={COL[c]}{tac_pl}+{COL[c]}{ocogs_pl}")
+    R.cogs_pl = cogs_pl
     r += 1
 
     gp_pl = r
-    ws.cell(row=r, column=1, value="Gross Profit 毛利润").font = FB; sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "Gross Profit 毛利润", "subtotal")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{rev_pl}-{CL(c)}{cogs_pl}")
+        fval(ws, r, c, f"={COL[c]}{rev_pl}-{COL[c]}{cogs_pl}")
     note(ws, r, "=Revenue-COGS")
     r += 1
-    ws.cell(row=r, column=1, value="  Gross Margin 毛利率").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  Gross Margin 毛利率", "small")
     pct_row(ws, r, gp_pl, rev_pl)
     r += 2
 
     # OpEx
     sec(ws, r, "Operating Expenses 营业费用 (OpEx)"); r += 1
     opex_spec = [
-        ("  R&D 研发费用", PL["R&D"], 63, "AI+Cloud持续投入，规模效应显现"),
-        ("  S&M 销售与营销费用", PL["S&M"], 64, "效率提升，费率持续下降"),
-        ("  G&A 管理费用 (含一次性项目)", PL["G&A"], 65, "2025含DOJ诉讼拨备，正常化后下降"),
+        ("  R&D 研发费用", PL["R&D"], "rd_pct", "AI+Cloud持续投入，规模效应显现"),
+        ("  S&M 销售与营销费用", PL["S&M"], "sm_pct", "效率提升，费率持续下降"),
+        ("  G&A 管理费用 (含一次性项目)", PL["G&A"], "ga_pct", "2025含DOJ诉讼拨备，正常化后下降"),
     ]
     opex_rows = []
-    for name, hist, ref_row, nt_text in opex_spec:
-        ws.cell(row=r, column=1, value=name).font = FN; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(hist):
-            hval(ws, r, 2+j, v)
+    for name, hist, ref_name, nt_text in opex_spec:
+        row_label(ws, r, name, "body")
+        hval_row(ws, r, hist)
         for c in range(5, 10):
-            fval(ws, r, c, f"={CL(c)}{rev_pl}*Assumptions!$I${ref_row}")
+            fval(ws, r, c, f"={COL[c]}{rev_pl}*{ref_name}")
         note(ws, r, nt_text)
         opex_rows.append(r); r += 1
-        ws.cell(row=r, column=1, value=f"    {name.strip().split('(')[0].strip()} %").font = FSM; ws.cell(row=r, column=1).border = BD
+        row_label(ws, r, f"    {name.strip().split('(')[0].strip()} %", "small")
         pct_row(ws, r, r-1, rev_pl); r += 1
 
     topex_pl = r
-    ws.cell(row=r, column=1, value="Estimated Total OpEx (R&D+S&M+G&A) 营业费用合计").font = FB
-    ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Estimated Total OpEx (R&D+S&M+G&A) 营业费用合计")
+    tot = col_sum(opex_rows)
     for c in range(2, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{x}" for x in opex_rows))
+        fval(ws, r, c, tot(COL[c]))
     note(ws, r, "参考性合计，EBIT由分部OI驱动")
     r += 1
 
     # EBIT = segment-driven
     ebit_pl = r
-    ws.cell(row=r, column=1, value="EBIT 经营利润 (=Sum of Segment OI)").font = FB
-    sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "EBIT 经营利润 (=Sum of Segment OI)", "key")
     for c in range(2, 10):
-        lval(ws, r, c, f"=Segment_PL!{CL(c)}{sum_seg_r}")
+        lval(ws, r, c, f"=Segment_PL!{COL[c]}{sum_seg_r}")
     note(ws, r, "分部驱动：链接自Segment_PL汇总OI")
-    R["ebit_pl"] = ebit_pl
+    R.ebit_pl = ebit_pl
     r += 1
-    ws.cell(row=r, column=1, value="  EBIT Margin 经营利润率").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  EBIT Margin 经营利润率", "small")
     pct_row(ws, r, ebit_pl, rev_pl)
     r += 1
-    ws.cell(row=r, column=1, value="  Implied OpEx (=GP-EBIT) 隐含OpEx").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  Implied OpEx (=GP-EBIT) 隐含OpEx", "small")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{gp_pl}-{CL(c)}{ebit_pl}")
-        ws.cell(row=r, column=c).font = FSM
+        fval(ws, r, c, f"={COL[c]}{gp_pl}-{COL[c]}{ebit_pl}", NI, font=FSM)
     r += 2
 
     # OI&E
     oie_pl = r
-    ws.cell(row=r, column=1, value="OI&E 其他收入/(支出)").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["OIE"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "OI&E 其他收入/(支出)", "body")
+    hval_row(ws, r, PL["OIE"])
     for j, v in enumerate([5000, 5500, 6000, 6500, 7000]):
-        c = ws.cell(row=r, column=5+j, value=v); c.number_format = NI; c.border = BD; c.fill = BLUE; c.font = FI
+        c = ws.cell(row=r, column=5+j, value=v); c.style = "input"; c.number_format = NI
     note(ws, r, "2025含$24B非上市证券估值收益(一次性)")
     r += 1
 
     pbt_pl = r
-    ws.cell(row=r, column=1, value="Pre-tax Income 税前利润").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Pre-tax Income 税前利润")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{ebit_pl}+{CL(c)}{oie_pl}")
+        fval(ws, r, c, f"={COL[c]}{ebit_pl}+{COL[c]}{oie_pl}")
     r += 1
     tax_pl = r
-    ws.cell(row=r, column=1, value="Income Tax 所得税").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["Tax"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Income Tax 所得税", "body")
+    hval_row(ws, r, PL["Tax"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{pbt_pl}*Assumptions!$I$11")
+        fval(ws, r, c, f"={COL[c]}{pbt_pl}*tax_rate")
     note(ws, r, "=Pre-tax Income×ETR")
     r += 1
 
     ni_pl = r
-    ws.cell(row=r, column=1, value="Net Income 净利润").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "Net Income 净利润", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{pbt_pl}-{CL(c)}{tax_pl}")
+        fval(ws, r, c, f"={COL[c]}{pbt_pl}-{COL[c]}{tax_pl}")
     note(ws, r, "=Pre-tax - Tax")
-    R["ni_pl"] = ni_pl
+    R.ni_pl = ni_pl
     r += 1
-    ws.cell(row=r, column=1, value="  Net Margin 净利率").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  Net Margin 净利率", "small")
     pct_row(ws, r, ni_pl, rev_pl)
     r += 1
-    ws.cell(row=r, column=1, value="  NI yoy %").font = FSM; ws.cell(row=r, column=1).border = BD
-    for j in range(1, 8):
-        fval(ws, r, 2+j, f"={CL(2+j)}{ni_pl}/{CL(1+j)}{ni_pl}-1", NP); ws.cell(row=r, column=2+j).font = FSM
+    yoy_row(ws, r, ni_pl, "  NI yoy %")
     r += 2
 
     # Memo items
     da_pl = r
-    ws.cell(row=r, column=1, value="D&A 折旧与摊销 (memo)").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["D&A"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "D&A 折旧与摊销 (memo)")
+    hval_row(ws, r, PL["D&A"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{rev_pl}*Assumptions!$I$66")
+        fval(ws, r, c, f"={COL[c]}{rev_pl}*da_pct")
     note(ws, r, "CapEx高增长→D&A占比上升")
-    R["da_pl"] = da_pl
+    R.da_pl = da_pl
     r += 1
 
     sbc_pl = r
-    ws.cell(row=r, column=1, value="SBC 股权激励 (memo)").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(PL["SBC"]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "SBC 股权激励 (memo)")
+    hval_row(ws, r, PL["SBC"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{rev_pl}*Assumptions!$I$67")
+        fval(ws, r, c, f"={COL[c]}{rev_pl}*sbc_pct")
     note(ws, r, "SBC占比逐步下降")
-    R["sbc_pl"] = sbc_pl
+    R.sbc_pl = sbc_pl
     r += 2
 
     # EPS
     shares_pl = r
-    ws.cell(row=r, column=1, value="Diluted Shares 稀释股数 (mm)").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(SHARES):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Diluted Shares 稀释股数 (mm)")
+    hval_row(ws, r, SHARES)
     for yr_j in range(5):
-        pc = 5+yr_j; prev = "D" if yr_j == 0 else CL(pc-1)
+        pc = 5+yr_j; prev = COL[pc-1]
         fval(ws, r, pc, f"={prev}{r}*0.98")
     note(ws, r, "年回购~2%股本")
-    R["shares_pl"] = shares_pl
+    R.shares_pl = shares_pl
     r += 1
 
     eps_pl = r
-    ws.cell(row=r, column=1, value="Diluted EPS 稀释每股收益").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "Diluted EPS 稀释每股收益", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{ni_pl}/{CL(c)}{shares_pl}", NU)
+        fval(ws, r, c, f"={COL[c]}{ni_pl}/{COL[c]}{shares_pl}", NU)
     note(ws, r, "=Net Income / Diluted Shares")
-    R["eps_pl"] = eps_pl
+    R.eps_pl = eps_pl
 
     ws.freeze_panes = "B4"
     add_legend(ws, r + 3)
 
     # ── Fill Segment_PL cross-check link ──
-    ws_seg = wb["Segment_PL"]
+    ws_seg = tabs["Segment_PL"]
     for c in range(2, 10):
-        lval(ws_seg, R["consol_ebit_link"], c, f"=Consolidated_PL!{CL(c)}{ebit_pl}")
+        lval(ws_seg, R.consol_ebit_link, c, f"=Consolidated_PL!{COL[c]}{ebit_pl}")
+    stream("Segment_PL", "Consolidated_PL")
 
     # ═══════════════════════════════════════════════════
     #  TAB 7: BALANCE SHEET (NEW)
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("BS")
-    ws["A1"] = "Consolidated Balance Sheet 合并资产负债表 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "Source: 10-K p.48 | 2023 estimated from prior filing"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
+    ws = new_tab("BS")
+    heading(ws, "Consolidated Balance Sheet 合并资产负债表 (USD mm)", "Source: 10-K p.48 | 2023 estimated from prior filing")
+    cw(ws, {COL[c]: (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
     yh(ws, 3)
 
     r = 5
@@ -993,36 +1161,36 @@ def build():
         ("Other Current Assets 其他流动资产", "OtherCA", "预付/库存/其他"),
     ]
     bs_rows = {}
+    # 2026E-2030E: (col, letter, prior letter, CapEx name, net-debt name)
+    bs_years = tuple(zip(range(5, 10), COL[5:10], COL[4:9], capex_names, debt_names))
+
+    def bs_forecast(spec):
+        """Fill each (key, template) row from one template; {c}/{p} are the
+        year/prior-year letters, {r} the row, {capex}/{debt} the year's names"""
+        for key, tmpl in spec:
+            rr = bs_rows[key]
+            for c, cl, pl, capex, debt in bs_years:
+                fval(ws, rr, c, tmpl.format(c=cl, p=pl, r=rr, capex=capex, debt=debt))
+
     for label, key, nt in bs_items_ca:
-        ws.cell(row=r, column=1, value=label).font = FN if "Total" not in label else FB
-        ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(BS_DATA[key]):
-            hval(ws, r, 2+j, v)
+        row_label(ws, r, label, "body" if "Total" not in label else "bold")
+        hval_row(ws, r, BS_DATA[key])
         bs_rows[key] = r
         note(ws, r, nt)
         r += 1
 
-    # Forecast current assets
-    # AR = Revenue × AR Days / 365
-    for c in range(5, 10):
-        fval(ws, bs_rows["AR"], c, f"=Consolidated_PL!{CL(c)}{rev_pl}*Assumptions!$I$84/365")
-    # Other current: ~4% of revenue
-    for c in range(5, 10):
-        fval(ws, bs_rows["OtherCA"], c, f"=Consolidated_PL!{CL(c)}{rev_pl}*0.04")
-    # Marketable securities: grow per assumption (Base=0% flat to preserve liquidity)
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["MktSec"], c, f"={prev}{bs_rows['MktSec']}*(1+Assumptions!$I$92)")
-    # Cash: will be filled as plug later
-    # Cash Total
-    for c in range(5, 10):
-        fval(ws, bs_rows["CashTotal"], c, f"={CL(c)}{bs_rows['Cash']}+{CL(c)}{bs_rows['MktSec']}")
+    # Forecast current assets (Cash: linked from Cash_Flow later)
+    bs_forecast((
+        ("AR", f"=Consolidated_PL!{{c}}{rev_pl}*ar_days/365"),  # Revenue × AR Days / 365
+        ("OtherCA", f"=Consolidated_PL!{{c}}{rev_pl}*0.04"),    # ~4% of revenue
+        ("MktSec", "={p}{r}*(1+mktsec_g)"),  # Base=0% flat to preserve liquidity
+        ("CashTotal", f"={{c}}{bs_rows['Cash']}+{{c}}{bs_rows['MktSec']}"),
+    ))
 
     total_ca_r = r
-    ws.cell(row=r, column=1, value="Total Current Assets 流动资产合计").font = FB
-    sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "Total Current Assets 流动资产合计", "subtotal")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{bs_rows['CashTotal']}+{CL(c)}{bs_rows['AR']}+{CL(c)}{bs_rows['OtherCA']}")
+        fval(ws, r, c, f"={COL[c]}{bs_rows['CashTotal']}+{COL[c]}{bs_rows['AR']}+{COL[c]}{bs_rows['OtherCA']}")
     r += 2
 
     sec(ws, r, "Non-Current Assets 非流动资产"); r += 1
@@ -1035,51 +1203,37 @@ def build():
         ("Other Non-current 其他非流动", "OtherNCA", "无形资产/其他"),
     ]
     for label, key, nt in bs_items_nca:
-        ws.cell(row=r, column=1, value=label).font = FN; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(BS_DATA[key]):
-            hval(ws, r, 2+j, v)
+        row_label(ws, r, label, "body")
+        hval_row(ws, r, BS_DATA[key])
         bs_rows[key] = r
         note(ws, r, nt)
         r += 1
 
     # Forecast non-current
-    # PP&E = prior + CapEx - D&A
-    for yr_j in range(5):
-        c = 5 + yr_j; prev = "D" if yr_j == 0 else CL(c-1)
-        fval(ws, bs_rows["PPE"], c, f"={prev}{bs_rows['PPE']}+Assumptions!$I${capex_rows[yr_j]}-Consolidated_PL!{CL(c)}{da_pl}")
-    # Non-marketable: grow per assumption
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["NonMktSec"], c, f"={prev}{bs_rows['NonMktSec']}*(1+Assumptions!$I$91)")
+    bs_forecast((
+        ("PPE", f"={{p}}{{r}}+{{capex}}-Consolidated_PL!{{c}}{da_pl}"),  # prior + CapEx - D&A
+        ("NonMktSec", "={p}{r}*(1+nonmkt_g)"),
+        ("OpLeaseAsset", "={p}{r}*(1+oplease_g)"),
+        ("Goodwill", "={p}{r}*1.02"),   # stable
+        ("OtherNCA", "={p}{r}*1.03"),   # stable growth
+    ))
     # Deferred tax: assume stable ~$9B
     for c in range(5, 10):
         fval(ws, bs_rows["DeferredTax"], c, 9000)
-    # Operating lease: grow per assumption
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["OpLeaseAsset"], c, f"={prev}{bs_rows['OpLeaseAsset']}*(1+Assumptions!$I$90)")
-    # Goodwill: stable
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["Goodwill"], c, f"={prev}{bs_rows['Goodwill']}*1.02")
-    # Other NCA: stable growth
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["OtherNCA"], c, f"={prev}{bs_rows['OtherNCA']}*1.03")
 
     total_nca_r = r
-    ws.cell(row=r, column=1, value="Total Non-Current Assets 非流动资产合计").font = FB
-    sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "Total Non-Current Assets 非流动资产合计", "subtotal")
     nca_items = ["NonMktSec", "DeferredTax", "PPE", "OpLeaseAsset", "Goodwill", "OtherNCA"]
+    tot = col_sum(bs_rows[k] for k in nca_items)
     for c in range(2, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{bs_rows[k]}" for k in nca_items))
+        fval(ws, r, c, tot(COL[c]))
     r += 1
 
     total_assets_r = r
-    ws.cell(row=r, column=1, value="TOTAL ASSETS 资产合计").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "TOTAL ASSETS 资产合计", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{total_ca_r}+{CL(c)}{total_nca_r}")
-    R["total_assets"] = total_assets_r
+        fval(ws, r, c, f"={COL[c]}{total_ca_r}+{COL[c]}{total_nca_r}")
+    R.total_assets = total_assets_r
     r += 2
 
     # LIABILITIES
@@ -1092,29 +1246,27 @@ def build():
         ("Deferred Revenue 递延收入", "DefRev", "Cloud预付合同增长"),
     ]
     for label, key, nt in bs_items_cl:
-        ws.cell(row=r, column=1, value=label).font = FN; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(BS_DATA[key]):
-            hval(ws, r, 2+j, v)
+        row_label(ws, r, label, "body")
+        hval_row(ws, r, BS_DATA[key])
         bs_rows[key] = r
         note(ws, r, nt)
         r += 1
 
     # Forecast CL
-    for c in range(5, 10):
-        fval(ws, bs_rows["AP"], c, f"=Consolidated_PL!{CL(c)}{R['cogs_pl']}*Assumptions!$I$85/365")
-        fval(ws, bs_rows["AccComp"], c, f"=Consolidated_PL!{CL(c)}{rev_pl}*Assumptions!$I$86")
-        fval(ws, bs_rows["AccExp"], c, f"=Consolidated_PL!{CL(c)}{rev_pl}*Assumptions!$I$87")
-        fval(ws, bs_rows["RevShare"], c, f"=Segment_Revenue!{CL(c)}{ad_total_r}*Assumptions!$I$88")
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["DefRev"], c, f"={prev}{bs_rows['DefRev']}*(1+Assumptions!$I$89)")
+    bs_forecast((
+        ("AP", f"=Consolidated_PL!{{c}}{R.cogs_pl}*ap_days/365"),
+        ("AccComp", f"=Consolidated_PL!{{c}}{rev_pl}*acccomp_pct"),
+        ("AccExp", f"=Consolidated_PL!{{c}}{rev_pl}*accexp_pct"),
+        ("RevShare", f"=Segment_Revenue!{{c}}{ad_total_r}*revshare_pct"),
+        ("DefRev", "={p}{r}*(1+defrev_g)"),
+    ))
 
     total_cl_r = r
-    ws.cell(row=r, column=1, value="Total Current Liabilities 流动负债合计").font = FB
-    sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "Total Current Liabilities 流动负债合计", "subtotal")
     cl_items = ["AP", "AccComp", "AccExp", "RevShare", "DefRev"]
+    tot = col_sum(bs_rows[k] for k in cl_items)
     for c in range(2, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{bs_rows[k]}" for k in cl_items))
+        fval(ws, r, c, tot(COL[c]))
     r += 2
 
     sec(ws, r, "Non-Current Liabilities 非流动负债"); r += 1
@@ -1125,69 +1277,63 @@ def build():
         ("Other Long-term 其他长期负债", "OtherLTL", ""),
     ]
     for label, key, nt in bs_items_ncl:
-        ws.cell(row=r, column=1, value=label).font = FN; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(BS_DATA[key]):
-            hval(ws, r, 2+j, v)
+        row_label(ws, r, label, "body")
+        hval_row(ws, r, BS_DATA[key])
         bs_rows[key] = r
         note(ws, r, nt)
         r += 1
 
     # Forecast NCL
-    for yr_j in range(5):
-        c = 5 + yr_j; prev = "D" if yr_j == 0 else CL(c-1)
-        fval(ws, bs_rows["LTDebt"], c, f"={prev}{bs_rows['LTDebt']}+Assumptions!$I${debt_rows[yr_j]}")
-    for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, bs_rows["TaxNC"], c, f"={prev}{bs_rows['TaxNC']}*1.03")
-        fval(ws, bs_rows["OpLeaseLiab"], c, f"={CL(c)}{bs_rows['OpLeaseAsset']}*0.84")  # ~84% of ROU
-        fval(ws, bs_rows["OtherLTL"], c, f"={prev}{bs_rows['OtherLTL']}*1.05")
+    bs_forecast((
+        ("LTDebt", "={p}{r}+{debt}"),
+        ("TaxNC", "={p}{r}*1.03"),
+        ("OpLeaseLiab", f"={{c}}{bs_rows['OpLeaseAsset']}*0.84"),  # ~84% of ROU
+        ("OtherLTL", "={p}{r}*1.05"),
+    ))
 
     total_ncl_r = r
     ncl_items = ["LTDebt", "TaxNC", "OpLeaseLiab", "OtherLTL"]
-    ws.cell(row=r, column=1, value="Total Non-Current Liabilities 非流动负债").font = FB
-    ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Total Non-Current Liabilities 非流动负债")
+    tot = col_sum(bs_rows[k] for k in ncl_items)
     for c in range(2, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{bs_rows[k]}" for k in ncl_items))
+        fval(ws, r, c, tot(COL[c]))
     r += 1
 
     total_liab_r = r
-    ws.cell(row=r, column=1, value="TOTAL LIABILITIES 负债合计").font = FB; sb(ws, r, 1, r, 9, fill=SUB, font=FB)
+    band(ws, r, "TOTAL LIABILITIES 负债合计", "subtotal")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{total_cl_r}+{CL(c)}{total_ncl_r}")
+        fval(ws, r, c, f"={COL[c]}{total_cl_r}+{COL[c]}{total_ncl_r}")
     r += 2
 
     # EQUITY
     sec(ws, r, "Stockholders' Equity 股东权益"); r += 1
     equity_r = r
-    ws.cell(row=r, column=1, value="Total Equity 股东权益合计").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
-    for j, v in enumerate(BS_DATA["Equity"]):
-        hval(ws, r, 2+j, v)
+    band(ws, r, "Total Equity 股东权益合计", "key")
+    hval_row(ws, r, BS_DATA["Equity"])
     # Equity forecast: prior + NI - Buyback - Dividends + SBC × (1 - settlement rate)
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
+        prev = COL[c-1]
         fval(ws, r, c,
-             f"={prev}{equity_r}+Consolidated_PL!{CL(c)}{ni_pl}"
-             f"-Assumptions!$I$79"
-             f"-Assumptions!$I$80*Consolidated_PL!{CL(c)}{R['shares_pl']}"
-             f"+Consolidated_PL!{CL(c)}{sbc_pl}*(1-Assumptions!$I$93)")
+             f"={prev}{equity_r}+Consolidated_PL!{COL[c]}{ni_pl}"
+             f"-buyback"
+             f"-div_ps*Consolidated_PL!{COL[c]}{R.shares_pl}"
+             f"+Consolidated_PL!{COL[c]}{sbc_pl}*(1-stocknet_pct)")
     note(ws, r, "=Prior+NI-Buyback-Div+SBC×(1-结算率)")
-    R["equity"] = equity_r
+    R.equity = equity_r
     r += 2
 
     # Total L&E
     total_le_r = r
-    ws.cell(row=r, column=1, value="TOTAL LIABILITIES & EQUITY 负债+权益").font = FB
-    sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "TOTAL LIABILITIES & EQUITY 负债+权益", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{total_liab_r}+{CL(c)}{equity_r}")
+        fval(ws, r, c, f"={COL[c]}{total_liab_r}+{COL[c]}{equity_r}")
     r += 1
 
     # Balance check
     chk_r = r
-    ws.cell(row=r, column=1, value="Balance Check 平衡检验 (Assets - L&E)").font = FB; ws.cell(row=r, column=1).border = BD
+    band(ws, r, "Balance Check 平衡检验 (Assets - L&E)", "err")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{total_assets_r}-{CL(c)}{total_le_r}")
-    sb(ws, chk_r, 1, chk_r, 9, fill=ERR, font=FB)
+        fval(ws, r, c, f"={COL[c]}{total_assets_r}-{COL[c]}{total_le_r}")
     note(ws, chk_r, "应为0 (Cash为plug项)")
 
     # Cash will be linked from Cash_Flow!Ending_Cash after CF tab is built
@@ -1200,10 +1346,9 @@ def build():
     #  TAB 8: CASH FLOW (Complete 3-statement linkage)
     #  Every BS change → CF entry → Ending Cash → BS Cash
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Cash_Flow")
-    ws["A1"] = "Cash Flow Statement 现金流量表 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "三表联动: Ending Cash → BS!Cash | Source: 10-K pp.51-52"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
+    ws = new_tab("Cash_Flow")
+    heading(ws, "Cash Flow Statement 现金流量表 (USD mm)", "三表联动: Ending Cash → BS!Cash | Source: 10-K pp.51-52")
+    cw(ws, {COL[c]: (44 if c == 1 else (38 if c == NCOL else 15)) for c in range(1, NCOL+1)})
     yh(ws, 3)
 
     r = 5
@@ -1212,65 +1357,64 @@ def build():
 
     # Net Income
     ni_cf = r
-    ws.cell(row=r, column=1, value="Net Income 净利润").font = FB; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["NI"]): hval(ws, r, 2+j, v)
-    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{CL(c)}{ni_pl}")
+    row_label(ws, r, "Net Income 净利润")
+    hval_row(ws, r, CF["NI"])
+    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{COL[c]}{ni_pl}")
     cf_op_rows.append(r); note(ws, r, "链接自Consolidated_PL"); r += 1
 
     # D&A
     da_cf = r
-    ws.cell(row=r, column=1, value="(+) D&A 折旧与摊销").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["DA"]): hval(ws, r, 2+j, v)
-    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{CL(c)}{da_pl}")
+    row_label(ws, r, "(+) D&A 折旧与摊销", "body")
+    hval_row(ws, r, CF["DA"])
+    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{COL[c]}{da_pl}")
     cf_op_rows.append(r); note(ws, r, "非现金项目加回"); r += 1
 
     # SBC
     sbc_cf = r
-    ws.cell(row=r, column=1, value="(+) SBC 股权激励").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["SBC"]): hval(ws, r, 2+j, v)
-    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{CL(c)}{sbc_pl}")
+    row_label(ws, r, "(+) SBC 股权激励", "body")
+    hval_row(ws, r, CF["SBC"])
+    for c in range(5, 10): lval(ws, r, c, f"=Consolidated_PL!{COL[c]}{sbc_pl}")
     cf_op_rows.append(r); note(ws, r, "非现金项目加回"); r += 1
 
     # ── Non-cash & other adjustments (linked to BS deltas) ──
     sec(ws, r, "Non-cash & Accrual Adjustments 非现金及应计调整"); r += 1
 
     # Deferred Tax: DTA decrease = cash source → -(current - prior)
-    ws.cell(row=r, column=1, value="Deferred Tax 递延所得税").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["DeferredTax"]): hval(ws, r, 2+j, v)
+    row_label(ws, r, "Deferred Tax 递延所得税", "body")
+    hval_row(ws, r, CF["DeferredTax"])
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=-(BS!{CL(c)}{bs_rows['DeferredTax']}-BS!{prev}{bs_rows['DeferredTax']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=-(BS!{COL[c]}{bs_rows['DeferredTax']}-BS!{prev}{bs_rows['DeferredTax']})")
     cf_op_rows.append(r); note(ws, r, "DTA减少=现金来源(链接BS)"); r += 1
 
     # OpLease net: ΔLiab - ΔAsset (non-cash amortization offset)
-    ws.cell(row=r, column=1, value="OpLease Net Adj 经营租赁净调整").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3): hval(ws, r, 2+j, 0)  # included in "Other" historically
+    row_label(ws, r, "OpLease Net Adj 经营租赁净调整", "body")
+    hval_row(ws, r, (0, 0, 0))  # included in "Other" historically
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=(BS!{CL(c)}{bs_rows['OpLeaseLiab']}-BS!{prev}{bs_rows['OpLeaseLiab']})"
-                        f"-(BS!{CL(c)}{bs_rows['OpLeaseAsset']}-BS!{prev}{bs_rows['OpLeaseAsset']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=(BS!{COL[c]}{bs_rows['OpLeaseLiab']}-BS!{prev}{bs_rows['OpLeaseLiab']})"
+                        f"-(BS!{COL[c]}{bs_rows['OpLeaseAsset']}-BS!{prev}{bs_rows['OpLeaseAsset']})")
     cf_op_rows.append(r); note(ws, r, "=Δ租赁负债-Δ租赁资产"); r += 1
 
     # TaxNC change: increase in LT tax liability = cash source
-    ws.cell(row=r, column=1, value="LT Tax Payable Chg 长期应交税").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3): hval(ws, r, 2+j, 0)
+    row_label(ws, r, "LT Tax Payable Chg 长期应交税", "body")
+    hval_row(ws, r, (0, 0, 0))
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=BS!{CL(c)}{bs_rows['TaxNC']}-BS!{prev}{bs_rows['TaxNC']}")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=BS!{COL[c]}{bs_rows['TaxNC']}-BS!{prev}{bs_rows['TaxNC']}")
     cf_op_rows.append(r); note(ws, r, "长期税负增加=现金来源"); r += 1
 
     # OtherLTL change
-    ws.cell(row=r, column=1, value="Other LT Liab Chg 其他长期负债").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3): hval(ws, r, 2+j, 0)
+    row_label(ws, r, "Other LT Liab Chg 其他长期负债", "body")
+    hval_row(ws, r, (0, 0, 0))
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=BS!{CL(c)}{bs_rows['OtherLTL']}-BS!{prev}{bs_rows['OtherLTL']}")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=BS!{COL[c]}{bs_rows['OtherLTL']}-BS!{prev}{bs_rows['OtherLTL']}")
     cf_op_rows.append(r); note(ws, r, "其他长期负债变动"); r += 1
 
     # Securities G/L + Other (historical only, 0 for forecast)
-    ws.cell(row=r, column=1, value="Securities G/L + Other 证券损益+其他").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate([CF["SecGL"][j] + CF["Other"][j] for j in range(3)]):
-        hval(ws, r, 2+j, v)
+    row_label(ws, r, "Securities G/L + Other 证券损益+其他", "body")
+    hval_row(ws, r, CF_NET["SecGLOther"])
     for c in range(5, 10): fval(ws, r, c, 0)
     cf_op_rows.append(r); note(ws, r, "2025含$24.6B证券损益(一次性)"); r += 1
 
@@ -1287,21 +1431,22 @@ def build():
         ("  Chg DefRev 递延收入变动",   CF["ChgDefRev"],   "DefRev",  False, "预收增加=现金留存"),
     ]
     for label, hist, bs_key, is_asset, nt in wc_specs:
-        ws.cell(row=r, column=1, value=label).font = FN; ws.cell(row=r, column=1).border = BD
-        for j, v in enumerate(hist): hval(ws, r, 2+j, v)
+        row_label(ws, r, label, "body")
+        hval_row(ws, r, hist)
         for c in range(5, 10):
-            prev = "D" if c == 5 else CL(c-1)
+            prev = COL[c-1]
             sign = "-" if is_asset else ""
-            fval(ws, r, c, f"={sign}(BS!{CL(c)}{bs_rows[bs_key]}-BS!{prev}{bs_rows[bs_key]})")
+            fval(ws, r, c, f"={sign}(BS!{COL[c]}{bs_rows[bs_key]}-BS!{prev}{bs_rows[bs_key]})")
         cf_op_rows.append(r); note(ws, r, nt); r += 1
 
     # ── CFO ──
     cfo_r = r
-    ws.cell(row=r, column=1, value="CFO 经营活动净现金").font = FB; sb(ws, r, 1, r, 9, fill=SUB, font=FB)
-    for j, v in enumerate(CF["CFO"]): hval(ws, r, 2+j, v)
+    band(ws, r, "CFO 经营活动净现金", "subtotal")
+    hval_row(ws, r, CF["CFO"])
+    tot = col_sum(cf_op_rows)
     for c in range(5, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{x}" for x in cf_op_rows))
-    note(ws, r, "=NI+D&A+SBC+非现金调整+WC变动"); R["cfo"] = cfo_r
+        fval(ws, r, c, tot(COL[c]))
+    note(ws, r, "=NI+D&A+SBC+非现金调整+WC变动"); R.cfo = cfo_r
     r += 2
 
     # ═══ Investing Activities ═══
@@ -1309,70 +1454,68 @@ def build():
     cf_inv_rows = []
 
     capex_cf = r
-    ws.cell(row=r, column=1, value="CapEx 资本支出").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["CapEx"]): hval(ws, r, 2+j, v)
-    for yr_j in range(5): fval(ws, r, 5+yr_j, f"=-Assumptions!$I${capex_rows[yr_j]}")
-    cf_inv_rows.append(r); note(ws, r, "2026=$180B per mgmt guidance"); R["capex_cf"] = capex_cf
+    row_label(ws, r, "CapEx 资本支出", "body")
+    hval_row(ws, r, CF["CapEx"])
+    for yr_j in range(5): fval(ws, r, 5+yr_j, f"=-{capex_names[yr_j]}")
+    cf_inv_rows.append(r); note(ws, r, "2026=$180B per mgmt guidance"); R.capex_cf = capex_cf
     r += 1
 
-    ws.cell(row=r, column=1, value="  CapEx / Revenue").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  CapEx / Revenue", "small")
     for c in range(2, 10):
-        fval(ws, r, c, f"=-{CL(c)}{capex_cf}/Consolidated_PL!{CL(c)}{rev_pl}", NP)
-        ws.cell(row=r, column=c).font = FSM
+        pval(ws, r, c, f"=-{COL[c]}{capex_cf}/Consolidated_PL!{COL[c]}{rev_pl}")
     r += 1
 
     # Chg NonMktSec (investment outflow)
-    ws.cell(row=r, column=1, value="Chg NonMkt Securities 非上市证券").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["OtherInv"]): hval(ws, r, 2+j, v)
+    row_label(ws, r, "Chg NonMkt Securities 非上市证券", "body")
+    hval_row(ws, r, CF["OtherInv"])
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=-(BS!{CL(c)}{bs_rows['NonMktSec']}-BS!{prev}{bs_rows['NonMktSec']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=-(BS!{COL[c]}{bs_rows['NonMktSec']}-BS!{prev}{bs_rows['NonMktSec']})")
     cf_inv_rows.append(r); note(ws, r, "非上市证券净投资(增加为负)"); r += 1
 
     # Chg Goodwill (acquisitions)
-    ws.cell(row=r, column=1, value="Acquisitions 收购 (Goodwill)").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3): hval(ws, r, 2+j, 0)
+    row_label(ws, r, "Acquisitions 收购 (Goodwill)", "body")
+    hval_row(ws, r, (0, 0, 0))
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=-(BS!{CL(c)}{bs_rows['Goodwill']}-BS!{prev}{bs_rows['Goodwill']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=-(BS!{COL[c]}{bs_rows['Goodwill']}-BS!{prev}{bs_rows['Goodwill']})")
     cf_inv_rows.append(r); note(ws, r, "商誉增加=并购现金流出"); r += 1
 
     # Chg OtherNCA
-    ws.cell(row=r, column=1, value="Other Investing 其他投资").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3): hval(ws, r, 2+j, 0)
+    row_label(ws, r, "Other Investing 其他投资", "body")
+    hval_row(ws, r, (0, 0, 0))
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=-(BS!{CL(c)}{bs_rows['OtherNCA']}-BS!{prev}{bs_rows['OtherNCA']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=-(BS!{COL[c]}{bs_rows['OtherNCA']}-BS!{prev}{bs_rows['OtherNCA']})")
     cf_inv_rows.append(r); note(ws, r, "无形资产/其他非流动"); r += 1
 
     # Net MktSec activity
-    ws.cell(row=r, column=1, value="Net MktSec Activity 有价证券净投资").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3):
-        hval(ws, r, 2+j, CF["BuyMktSec"][j] + CF["SellMktSec"][j])
+    row_label(ws, r, "Net MktSec Activity 有价证券净投资", "body")
+    hval_row(ws, r, CF_NET["MktSecNet"])
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
-        fval(ws, r, c, f"=-(BS!{CL(c)}{bs_rows['MktSec']}-BS!{prev}{bs_rows['MktSec']})")
+        prev = COL[c-1]
+        fval(ws, r, c, f"=-(BS!{COL[c]}{bs_rows['MktSec']}-BS!{prev}{bs_rows['MktSec']})")
     cf_inv_rows.append(r); note(ws, r, "有价证券增加=现金流出(Base=0)"); r += 1
 
     # CFI
     cfi_r = r
-    ws.cell(row=r, column=1, value="CFI 投资活动净现金").font = FB; sb(ws, r, 1, r, 9, fill=SUB, font=FB)
-    for j, v in enumerate(CF["CFI"]): hval(ws, r, 2+j, v)
+    band(ws, r, "CFI 投资活动净现金", "subtotal")
+    hval_row(ws, r, CF["CFI"])
+    tot = col_sum(cf_inv_rows)
     for c in range(5, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{x}" for x in cf_inv_rows))
+        fval(ws, r, c, tot(COL[c]))
     note(ws, r, "=CapEx+证券+收购+其他"); r += 2
 
     # FCF = CFO + CapEx
     fcf_r = r
-    ws.cell(row=r, column=1, value="FCF 自由现金流 (=CFO+CapEx)").font = FB; sb(ws, r, 1, r, 9, fill=KEY, font=FB)
+    band(ws, r, "FCF 自由现金流 (=CFO+CapEx)", "key")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{cfo_r}+{CL(c)}{capex_cf}")
-    note(ws, r, "=CFO-|CapEx| (资本配置前)"); R["fcf"] = fcf_r
+        fval(ws, r, c, f"={COL[c]}{cfo_r}+{COL[c]}{capex_cf}")
+    note(ws, r, "=CFO-|CapEx| (资本配置前)"); R.fcf = fcf_r
     r += 1
-    ws.cell(row=r, column=1, value="  FCF Margin 自由现金流率").font = FSM; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "  FCF Margin 自由现金流率", "small")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{fcf_r}/Consolidated_PL!{CL(c)}{rev_pl}", NP)
-        ws.cell(row=r, column=c).font = FSM
+        pval(ws, r, c, f"={COL[c]}{fcf_r}/Consolidated_PL!{COL[c]}{rev_pl}")
     r += 2
 
     # ═══ Financing Activities ═══
@@ -1380,163 +1523,156 @@ def build():
     cf_fin_rows = []
 
     bb_r = r
-    ws.cell(row=r, column=1, value="Share Repurchases 股份回购").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["Buyback"]): hval(ws, r, 2+j, v)
-    for c in range(5, 10): fval(ws, r, c, "=-Assumptions!$I$79")
+    row_label(ws, r, "Share Repurchases 股份回购", "body")
+    hval_row(ws, r, CF["Buyback"])
+    for c in range(5, 10): fval(ws, r, c, "=-buyback")
     cf_fin_rows.append(r); note(ws, r, "链接自Assumptions回购假设"); r += 1
 
     div_cf = r
-    ws.cell(row=r, column=1, value="Dividends Paid 股息支付").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["Dividend"]): hval(ws, r, 2+j, v)
+    row_label(ws, r, "Dividends Paid 股息支付", "body")
+    hval_row(ws, r, CF["Dividend"])
     for c in range(5, 10):
-        fval(ws, r, c, f"=-Assumptions!$I$80*Consolidated_PL!{CL(c)}{R['shares_pl']}")
+        fval(ws, r, c, f"=-div_ps*Consolidated_PL!{COL[c]}{R.shares_pl}")
     cf_fin_rows.append(r); note(ws, r, "=-DPS×稀释股数"); r += 1
 
     # StockNet Settlement (NEW)
     stocknet_cf = r
-    ws.cell(row=r, column=1, value="Stock Net Settlement 股权净结算").font = FN; ws.cell(row=r, column=1).border = BD
-    for j, v in enumerate(CF["StockNet"]): hval(ws, r, 2+j, v)
+    row_label(ws, r, "Stock Net Settlement 股权净结算", "body")
+    hval_row(ws, r, CF["StockNet"])
     for c in range(5, 10):
-        fval(ws, r, c, f"=-Consolidated_PL!{CL(c)}{sbc_pl}*Assumptions!$I$93")
+        fval(ws, r, c, f"=-Consolidated_PL!{COL[c]}{sbc_pl}*stocknet_pct")
     cf_fin_rows.append(r); note(ws, r, "=-SBC×结算率(RSU税代扣)"); r += 1
 
     # Net Debt Issuance (NEW)
     debt_cf = r
-    ws.cell(row=r, column=1, value="Net Debt Issuance 净债务融资").font = FN; ws.cell(row=r, column=1).border = BD
-    for j in range(3):
-        hval(ws, r, 2+j, CF["DebtIssue"][j] + CF["DebtRepay"][j])
+    row_label(ws, r, "Net Debt Issuance 净债务融资", "body")
+    hval_row(ws, r, CF_NET["DebtNet"])
     for yr_j in range(5):
-        fval(ws, r, 5+yr_j, f"=Assumptions!$I${debt_rows[yr_j]}")
+        fval(ws, r, 5+yr_j, f"={debt_names[yr_j]}")
     cf_fin_rows.append(r); note(ws, r, "链接自Assumptions融资计划"); r += 1
 
     # CFF
     cff_r = r
-    ws.cell(row=r, column=1, value="CFF 融资活动净现金").font = FB; sb(ws, r, 1, r, 9, fill=SUB, font=FB)
-    for j, v in enumerate(CF["CFF"]): hval(ws, r, 2+j, v)
+    band(ws, r, "CFF 融资活动净现金", "subtotal")
+    hval_row(ws, r, CF["CFF"])
+    tot = col_sum(cf_fin_rows)
     for c in range(5, 10):
-        fval(ws, r, c, "=" + "+".join(f"{CL(c)}{x}" for x in cf_fin_rows))
+        fval(ws, r, c, tot(COL[c]))
     note(ws, r, "=回购+股息+股权结算+净融资"); r += 2
 
     # ═══ Cash Reconciliation (core 3-statement link) ═══
     sec(ws, r, "Cash Reconciliation 现金勾稽 (→ BS!Cash)"); r += 1
 
     net_chg_r = r
-    ws.cell(row=r, column=1, value="Net Change in Cash 现金净变动").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Net Change in Cash 现金净变动")
     for c in range(2, 10):
-        fval(ws, r, c, f"={CL(c)}{cfo_r}+{CL(c)}{cfi_r}+{CL(c)}{cff_r}")
+        fval(ws, r, c, f"={COL[c]}{cfo_r}+{COL[c]}{cfi_r}+{COL[c]}{cff_r}")
     note(ws, r, "=CFO+CFI+CFF"); r += 1
 
     beg_cash_r = r
-    ws.cell(row=r, column=1, value="Beginning Cash 期初现金").font = FN; ws.cell(row=r, column=1).border = BD
-    hval(ws, r, 3, BS_DATA["Cash"][0])  # 2024 beginning = 2023 ending
-    hval(ws, r, 4, BS_DATA["Cash"][1])  # 2025 beginning = 2024 ending
+    row_label(ws, r, "Beginning Cash 期初现金", "body")
+    hval_row(ws, r, BS_DATA["Cash"][:2], col=3)  # 2024/2025 beginning = prior year ending
     for c in range(5, 10):
-        prev = "D" if c == 5 else CL(c-1)
+        prev = COL[c-1]
         fval(ws, r, c, f"={prev}{r+1}")  # = prior Ending Cash
     note(ws, r, "=上期末现金"); r += 1
 
     end_cash_r = r
-    ws.cell(row=r, column=1, value="Ending Cash 期末现金 ★").font = FB
-    sb(ws, r, 1, r, 9, fill=KEY, font=FB)
-    for j, v in enumerate(BS_DATA["Cash"]): hval(ws, r, 2+j, v)
+    band(ws, r, "Ending Cash 期末现金 ★", "key")
+    hval_row(ws, r, BS_DATA["Cash"])
     for c in range(5, 10):
-        fval(ws, r, c, f"={CL(c)}{beg_cash_r}+{CL(c)}{net_chg_r}")
-    note(ws, r, "=期初+净变动 → 链接至BS!Cash"); R["end_cash"] = end_cash_r
+        fval(ws, r, c, f"={COL[c]}{beg_cash_r}+{COL[c]}{net_chg_r}")
+    note(ws, r, "=期初+净变动 → 链接至BS!Cash"); R.end_cash = end_cash_r
     r += 2
 
     # BS Balance integrity check (should = 0 if 3-stmt linkage is correct)
-    ws.cell(row=r, column=1, value="验证: BS Balance Check (Assets-L&E)").font = FB; ws.cell(row=r, column=1).border = BD
+    band(ws, r, "验证: BS Balance Check (Assets-L&E)", "err")
     for c in range(5, 10):
-        fval(ws, r, c, f"=BS!{CL(c)}{total_assets_r}-BS!{CL(c)}{total_le_r}")
-    sb(ws, r, 1, r, 9, fill=ERR, font=FB)
+        fval(ws, r, c, f"=BS!{COL[c]}{total_assets_r}-BS!{COL[c]}{total_le_r}")
     note(ws, r, "应为0 → 证明三表完美联动")
 
     ws.freeze_panes = "B4"
     add_legend(ws, r + 3)
 
     # ── Link BS Cash to CF Ending Cash (3-statement linkage core) ──
-    ws_bs = wb["BS"]
+    ws_bs = tabs["BS"]
     for c in range(5, 10):
-        lval(ws_bs, bs_rows["Cash"], c, f"=Cash_Flow!{CL(c)}{end_cash_r}")
+        lval(ws_bs, bs_rows["Cash"], c, f"=Cash_Flow!{COL[c]}{end_cash_r}")
+    stream("BS", "Cash_Flow")
 
     # ═══════════════════════════════════════════════════
     #  TAB 9: DCF
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("DCF")
-    ws["A1"] = "DCF Valuation DCF估值 (USD mm)"; ws["A1"].font = FT
-    ws["A2"] = "CapEx 2026 = $180B per mgmt guidance"; ws["A2"].font = FSM
+    ws = new_tab("DCF")
+    heading(ws, "DCF Valuation DCF估值 (USD mm)", "CapEx 2026 = $180B per mgmt guidance")
     cw(ws, {"A": 44, "B": 16, "C": 16, "D": 16, "E": 16, "F": 16, "G": 38})
-    for i, yr in enumerate(["2026E", "2027E", "2028E", "2029E", "2030E"]):
-        c = ws.cell(row=4, column=2+i, value=yr); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-    ws.cell(row=4, column=1).fill = HDR; ws.cell(row=4, column=1).border = BD
-    nc = ws.cell(row=4, column=7, value="Notes / 预测逻辑"); nc.font = FW; nc.fill = HDR; nc.alignment = CT; nc.border = BD
+    hdr_row(ws, 4, ["2026E", "2027E", "2028E", "2029E", "2030E", "Notes / 预测逻辑"], col=2)
+    _styled(ws.cell(row=4, column=1), fill=HDR)
+
+    # 2026E-2030E in B..F: (col, letter, PL letter, prior PL letter, CapEx name, year n)
+    dcf_years = tuple(zip(range(2, 7), COL[2:7], COL[5:10], COL[4:9], capex_names, range(1, 6)))
+
+    def dcf_row(r, tmpl, put=fval, fmt=NI):
+        """Fill B..F from one template; {c} is the DCF column, {s}/{p} the
+        year's/prior year's Consolidated_PL column, {n} the discount year"""
+        for c, cl, src, prev, capex, n in dcf_years:
+            put(ws, r, c, tmpl.format(c=cl, s=src, p=prev, capex=capex, n=n), fmt)
 
     r = 6
     ebit_dcf = r
-    ws.cell(row=r, column=1, value="EBIT 经营利润").font = FB; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        lval(ws, r, 2+i, f"=Consolidated_PL!{CL(5+i)}{ebit_pl}")
-    ws.cell(row=r, column=7, value="链接自Consolidated_PL").font = FNOTE; ws.cell(row=r, column=7).border = BD
+    row_label(ws, r, "EBIT 经营利润")
+    dcf_row(r, f"=Consolidated_PL!{{s}}{ebit_pl}", lval)
+    ws.cell(row=r, column=7, value="链接自Consolidated_PL").style = "aside"
     r += 1
     tax_dcf = r
-    ws.cell(row=r, column=1, value="(-) Tax on EBIT EBIT税负").font = FN; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        fval(ws, r, 2+i, f"={CL(2+i)}{ebit_dcf}*Assumptions!$I$11")
+    row_label(ws, r, "(-) Tax on EBIT EBIT税负", "body")
+    dcf_row(r, f"={{c}}{ebit_dcf}*tax_rate")
     r += 1
     nopat_dcf = r
-    ws.cell(row=r, column=1, value="NOPAT 税后净营业利润").font = FB; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        fval(ws, r, 2+i, f"={CL(2+i)}{ebit_dcf}-{CL(2+i)}{tax_dcf}")
-    ws.cell(row=r, column=7, value="EBIT×(1-Tax Rate)").font = FNOTE; ws.cell(row=r, column=7).border = BD
+    row_label(ws, r, "NOPAT 税后净营业利润")
+    dcf_row(r, f"={{c}}{ebit_dcf}-{{c}}{tax_dcf}")
+    ws.cell(row=r, column=7, value="EBIT×(1-Tax Rate)").style = "aside"
     r += 1
     da_dcf = r
-    ws.cell(row=r, column=1, value="(+) D&A 折旧摊销").font = FN; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        lval(ws, r, 2+i, f"=Consolidated_PL!{CL(5+i)}{da_pl}")
+    row_label(ws, r, "(+) D&A 折旧摊销", "body")
+    dcf_row(r, f"=Consolidated_PL!{{s}}{da_pl}", lval)
     r += 1
     capex_dcf = r
-    ws.cell(row=r, column=1, value="(-) CapEx 资本支出").font = FN; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        fval(ws, r, 2+i, f"=Assumptions!$I${capex_rows[i]}")
-    ws.cell(row=r, column=7, value="2026=$180B management guidance").font = FNOTE; ws.cell(row=r, column=7).border = BD
+    row_label(ws, r, "(-) CapEx 资本支出", "body")
+    dcf_row(r, "={capex}")
+    ws.cell(row=r, column=7, value="2026=$180B management guidance").style = "aside"
     r += 1
     nwc_dcf = r
-    ws.cell(row=r, column=1, value="(-) Change in NWC 净营运资本变动").font = FN; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        src = CL(5+i); prev = "D" if i == 0 else CL(4+i)
-        fval(ws, r, 2+i, f"=(Consolidated_PL!{src}{rev_pl}-Consolidated_PL!{prev}{rev_pl})*Assumptions!$I$68")
+    row_label(ws, r, "(-) Change in NWC 净营运资本变动", "body")
+    dcf_row(r, f"=(Consolidated_PL!{{s}}{rev_pl}-Consolidated_PL!{{p}}{rev_pl})*nwc_pct")
     r += 1
 
     ufcf_dcf = r
-    ws.cell(row=r, column=1, value="UFCF 无杠杆自由现金流").font = FB; sb(ws, r, 1, r, 6, fill=KEY, font=FB)
-    for i in range(5):
-        cl = CL(2+i)
-        fval(ws, r, 2+i, f"={cl}{nopat_dcf}+{cl}{da_dcf}-{cl}{capex_dcf}-{cl}{nwc_dcf}")
-    ws.cell(row=r, column=7, value="NOPAT+D&A-CapEx-ΔNWC").font = FNOTE; ws.cell(row=r, column=7).border = BD
+    band(ws, r, "UFCF 无杠杆自由现金流", "key", ncols=6)
+    dcf_row(r, f"={{c}}{nopat_dcf}+{{c}}{da_dcf}-{{c}}{capex_dcf}-{{c}}{nwc_dcf}")
+    ws.cell(row=r, column=7, value="NOPAT+D&A-CapEx-ΔNWC").style = "aside"
     r += 1
     df_dcf = r
-    ws.cell(row=r, column=1, value="Discount Factor 折现因子").font = FN; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        fval(ws, r, 2+i, f"=1/(1+Assumptions!$I$18)^{i+1}", "0.0000")
+    row_label(ws, r, "Discount Factor 折现因子", "body")
+    dcf_row(r, "=1/(1+wacc)^{n}", fmt="0.0000")
     r += 1
     pv_dcf = r
-    ws.cell(row=r, column=1, value="PV of UFCF UFCF现值").font = FB; ws.cell(row=r, column=1).border = BD
-    for i in range(5):
-        fval(ws, r, 2+i, f"={CL(2+i)}{ufcf_dcf}*{CL(2+i)}{df_dcf}")
+    row_label(ws, r, "PV of UFCF UFCF现值")
+    dcf_row(r, f"={{c}}{ufcf_dcf}*{{c}}{df_dcf}")
     r += 2
 
     # Terminal Value
     tv_r = r
-    ws.cell(row=r, column=1, value="TV 终值 (Gordon Growth Model)").font = FB; ws.cell(row=r, column=1).border = BD
-    fval(ws, r, 2, f"=F{ufcf_dcf}*(1+Assumptions!$I$13)/(Assumptions!$I$18-Assumptions!$I$13)")
-    ws.cell(row=r, column=7, value="UFCF₂₀₃₀×(1+g)/(WACC-g)").font = FNOTE; ws.cell(row=r, column=7).border = BD
+    row_label(ws, r, "TV 终值 (Gordon Growth Model)")
+    fval(ws, r, 2, f"=F{ufcf_dcf}*(1+tv_growth)/(wacc-tv_growth)")
+    ws.cell(row=r, column=7, value="UFCF₂₀₃₀×(1+g)/(WACC-g)").style = "aside"
     r += 1
     pvtv_r = r
-    ws.cell(row=r, column=1, value="PV of TV 终值现值").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "PV of TV 终值现值")
     fval(ws, r, 2, f"=B{tv_r}*F{df_dcf}")
     r += 1
-    ws.cell(row=r, column=1, value="TV as % of EV TV占比").font = FSM; ws.cell(row=r, column=1).border = BD
-    fval(ws, r, 2, f"=B{pvtv_r}/(SUM(B{pv_dcf}:F{pv_dcf})+B{pvtv_r})", NP)
+    row_label(ws, r, "TV as % of EV TV占比", "small")
+    pval(ws, r, 2, f"=B{pvtv_r}/(SUM(B{pv_dcf}:F{pv_dcf})+B{pvtv_r})", font=None)
     r += 2
 
     # EV Bridge
@@ -1544,163 +1680,161 @@ def build():
         ("Sum of PV of UFCF UFCF现值合计", f"=SUM(B{pv_dcf}:F{pv_dcf})", "5年UFCF折现合计"),
         ("PV of TV 终值现值", f"=B{pvtv_r}", ""),
         ("EV 企业价值", None, "=UFCF PV + TV PV"),
-        ("(+) Cash & Securities 加回现金", "=Assumptions!$I$21", "年末现金+有价证券"),
-        ("(-) Total Debt 减去债务", "=Assumptions!$I$22", "短期+长期债务"),
+        ("(+) Cash & Securities 加回现金", "=cash_sec", "年末现金+有价证券"),
+        ("(-) Total Debt 减去债务", "=total_debt", "短期+长期债务"),
         ("Equity Value 股权价值", None, "=EV+Cash-Debt"),
-        ("Diluted Shares 稀释股数 (mm)", "=Assumptions!$I$23", ""),
+        ("Diluted Shares 稀释股数 (mm)", "=dil_shares", ""),
         ("Implied Share Price 隐含股价", None, "=Equity Value / Shares"),
     ]
     for i, (name, form, nt) in enumerate(bridge):
         rr = r + i
-        ws.cell(row=rr, column=1, value=name).font = FB; ws.cell(row=rr, column=1).border = BD
         if form:
+            row_label(ws, rr, name)
             fval(ws, rr, 2, form)
         elif "EV" in name and "企业" in name:
+            band(ws, rr, name, "subtotal", ncols=2)
             fval(ws, rr, 2, f"=B{rr-2}+B{rr-1}")
-            sb(ws, rr, 1, rr, 2, fill=SUB, font=FB)
         elif "Equity Value" in name:
+            band(ws, rr, name, "subtotal", ncols=2)
             fval(ws, rr, 2, f"=B{rr-3}+B{rr-2}-B{rr-1}")
-            sb(ws, rr, 1, rr, 2, fill=SUB, font=FB)
         elif "Implied" in name:
+            band(ws, rr, name, "key", ncols=2)
             fval(ws, rr, 2, f"=B{rr-2}/B{rr-1}", NU)
-            sb(ws, rr, 1, rr, 2, fill=KEY, font=FB)
         if nt:
-            ws.cell(row=rr, column=7, value=nt).font = FNOTE; ws.cell(row=rr, column=7).border = BD
+            ws.cell(row=rr, column=7, value=nt).style = "aside"
 
     ws.freeze_panes = "B5"
     add_legend(ws, r + len(bridge) + 3)
+    stream("DCF")
 
     # ═══════════════════════════════════════════════════
     #  TAB 10: SENSITIVITY
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Sensitivity")
-    ws["A1"] = "Sensitivity 敏感性分析 - Implied Share Price (USD)"; ws["A1"].font = FT
-    ws["A2"] = "WACC 加权平均资本成本 × g 永续增长率"; ws["A2"].font = FSM
-    cw(ws, {CL(c): 16 for c in range(1, 9)}); ws.column_dimensions["A"].width = 18
+    ws = new_tab("Sensitivity")
+    heading(ws, "Sensitivity 敏感性分析 - Implied Share Price (USD)", "WACC 加权平均资本成本 × g 永续增长率")
+    cw(ws, {"A": 18, **{COL[c]: 16 for c in range(2, 9)}})
 
     waccs = [0.075, 0.080, 0.085, 0.090, 0.095, 0.100, 0.105]
     gs = [0.020, 0.025, 0.030, 0.035, 0.040]
 
-    ws.cell(row=4, column=1, value="g \\ WACC").font = FB; ws.cell(row=4, column=1).fill = SUB
-    ws.cell(row=4, column=1).border = BD; ws.cell(row=4, column=1).alignment = CT
+    _cell = ws.cell
+    _cell(row=4, column=1, value="g \\ WACC").style = "axis"
     for j, w in enumerate(waccs):
-        c = ws.cell(row=4, column=2+j, value=w)
-        c.number_format = NP2; c.fill = HDR; c.font = FW; c.alignment = CT; c.border = BD
+        c = _cell(row=4, column=2+j, value=w); c.style = "hdr"; c.number_format = NP2
 
+    # DCF rows baked in once; only the WACC column and g row vary
+    price = (f"=(SUM(DCF!B{pv_dcf}:F{pv_dcf})"
+             f"+(DCF!F{ufcf_dcf}*(1+$A{{1}})/({{0}}$4-$A{{1}}))/((1+{{0}}$4)^5)"
+             f"+cash_sec-total_debt)"
+             f"/dil_shares").format
     for i, g in enumerate(gs):
         rr = 5 + i
-        ws.cell(row=rr, column=1, value=g).number_format = NP2
-        ws.cell(row=rr, column=1).fill = SUB; ws.cell(row=rr, column=1).font = FB
-        ws.cell(row=rr, column=1).alignment = CT; ws.cell(row=rr, column=1).border = BD
+        c = _cell(row=rr, column=1, value=g); c.style = "axis"; c.number_format = NP2
         for j in range(len(waccs)):
-            cl = CL(2+j)
-            formula = (
-                f"=(SUM(DCF!B{pv_dcf}:F{pv_dcf})"
-                f"+(DCF!F{ufcf_dcf}*(1+$A{rr})/({cl}$4-$A{rr}))/((1+{cl}$4)^5)"
-                f"+Assumptions!$I$21-Assumptions!$I$22)"
-                f"/Assumptions!$I$23"
-            )
-            ws.cell(row=rr, column=2+j, value=formula).number_format = NU
-            ws.cell(row=rr, column=2+j).border = BD
+            _cell(row=rr, column=2+j, value=price(COL[2+j], rr)).style = "price"
 
     ws.freeze_panes = "B5"
     add_legend(ws, 12)
+    stream("Sensitivity")
 
     # ═══════════════════════════════════════════════════
     #  TAB 11: RATIO ANALYSIS (NEW)
     # ═══════════════════════════════════════════════════
-    ws = wb.create_sheet("Ratio_Analysis")
-    ws["A1"] = "Financial Ratio Analysis 财务比率分析"; ws["A1"].font = FT
-    ws["A2"] = "单位：百分比或倍数 (% or Multiple)"; ws["A2"].font = FSM
-    cw(ws, {CL(c): (40 if c == 1 else (38 if c == NCOL else 14)) for c in range(1, NCOL+1)})
+    ws = new_tab("Ratio_Analysis")
+    heading(ws, "Financial Ratio Analysis 财务比率分析", "单位：百分比或倍数 (% or Multiple)")
+    cw(ws, {COL[c]: (40 if c == 1 else (38 if c == NCOL else 14)) for c in range(1, NCOL+1)})
     yh(ws, 3)
 
     r = 5
     P = "Consolidated_PL"
     S = "Segment_Revenue"
     B = "BS"
+    ar_r, ap_r = bs_rows["AR"], bs_rows["AP"]
+    cash_sec_r, ltd_r = bs_rows["CashTotal"], bs_rows["LTDebt"]
 
     sec(ws, r, "Profitability 盈利能力"); r += 1
     ratio_items_profit = [
-        ("Gross Margin 毛利率", f"=({P}!{{c}}{rev_pl}-{P}!{{c}}{R['cogs_pl']})/{P}!{{c}}{rev_pl}", "毛利/收入"),
+        ("Gross Margin 毛利率", f"=({P}!{{c}}{rev_pl}-{P}!{{c}}{R.cogs_pl})/{P}!{{c}}{rev_pl}", "毛利/收入"),
         ("EBIT Margin 经营利润率", f"={P}!{{c}}{ebit_pl}/{P}!{{c}}{rev_pl}", "经营利润/收入"),
         ("Net Margin 净利率", f"={P}!{{c}}{ni_pl}/{P}!{{c}}{rev_pl}", "净利润/收入"),
         ("ROE 净资产收益率", f"={P}!{{c}}{ni_pl}/{B}!{{c}}{equity_r}", "净利润/股东权益"),
         ("ROA 总资产收益率", f"={P}!{{c}}{ni_pl}/{B}!{{c}}{total_assets_r}", "净利润/总资产"),
     ]
     for name, tmpl, nt in ratio_items_profit:
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
+        row_label(ws, r, name)
         for c in range(2, 10):
-            fval(ws, r, c, tmpl.format(c=CL(c)), NP)
+            pval(ws, r, c, tmpl.format(c=COL[c]), font=None)
         note(ws, r, nt)
         r += 1
     r += 1
 
     sec(ws, r, "Operating Efficiency 营运效率"); r += 1
     # AR Days
-    ws.cell(row=r, column=1, value="AR Days 应收账款周转天数").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "AR Days 应收账款周转天数")
     for c in range(2, 10):
-        fval(ws, r, c, f"={B}!{CL(c)}{bs_rows['AR']}/{P}!{CL(c)}{rev_pl}*365", "0.0")
+        fval(ws, r, c, f"={B}!{COL[c]}{ar_r}/{P}!{COL[c]}{rev_pl}*365", "0.0")
     note(ws, r, "应收/收入×365")
     r += 1
     # AP Days
-    ws.cell(row=r, column=1, value="AP Days 应付账款周转天数").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "AP Days 应付账款周转天数")
     for c in range(2, 10):
-        fval(ws, r, c, f"={B}!{CL(c)}{bs_rows['AP']}/{P}!{CL(c)}{R['cogs_pl']}*365", "0.0")
+        fval(ws, r, c, f"={B}!{COL[c]}{ap_r}/{P}!{COL[c]}{R.cogs_pl}*365", "0.0")
     note(ws, r, "应付/COGS×365")
     r += 1
     # CapEx Intensity
-    ws.cell(row=r, column=1, value="CapEx Intensity 资本支出强度").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "CapEx Intensity 资本支出强度")
     for c in range(2, 10):
-        fval(ws, r, c, f"=-Cash_Flow!{CL(c)}{capex_cf}/{P}!{CL(c)}{rev_pl}", NP)
+        pval(ws, r, c, f"=-Cash_Flow!{COL[c]}{capex_cf}/{P}!{COL[c]}{rev_pl}", font=None)
     note(ws, r, "|CapEx|/Revenue")
     r += 1
     # CapEx / D&A
-    ws.cell(row=r, column=1, value="CapEx / D&A 资本支出/折旧").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "CapEx / D&A 资本支出/折旧")
     for c in range(2, 10):
-        fval(ws, r, c, f"=-Cash_Flow!{CL(c)}{capex_cf}/{P}!{CL(c)}{da_pl}", "0.0x")
+        fval(ws, r, c, f"=-Cash_Flow!{COL[c]}{capex_cf}/{P}!{COL[c]}{da_pl}", "0.0x")
     note(ws, r, ">1x表示净投资增长")
     r += 2
 
     sec(ws, r, "Leverage 杠杆与偿债能力"); r += 1
-    ws.cell(row=r, column=1, value="Debt / Assets 资产负债率").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Debt / Assets 资产负债率")
     for c in range(2, 10):
-        fval(ws, r, c, f"=({B}!{CL(c)}{total_assets_r}-{B}!{CL(c)}{equity_r})/{B}!{CL(c)}{total_assets_r}", NP)
+        pval(ws, r, c, f"=({B}!{COL[c]}{total_assets_r}-{B}!{COL[c]}{equity_r})/{B}!{COL[c]}{total_assets_r}", font=None)
     note(ws, r, "总负债/总资产")
     r += 1
-    ws.cell(row=r, column=1, value="Current Ratio 流动比率").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Current Ratio 流动比率")
     for c in range(2, 10):
-        fval(ws, r, c, f"={B}!{CL(c)}{total_ca_r}/{B}!{CL(c)}{total_cl_r}", "0.00x")
+        fval(ws, r, c, f"={B}!{COL[c]}{total_ca_r}/{B}!{COL[c]}{total_cl_r}", "0.00x")
     note(ws, r, "流动资产/流动负债")
     r += 1
-    ws.cell(row=r, column=1, value="Net Cash 净现金 (mm)").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "Net Cash 净现金 (mm)")
     for c in range(2, 10):
-        fval(ws, r, c, f"={B}!{CL(c)}{bs_rows['CashTotal']}-{B}!{CL(c)}{bs_rows['LTDebt']}")
+        fval(ws, r, c, f"={B}!{COL[c]}{cash_sec_r}-{B}!{COL[c]}{ltd_r}")
     note(ws, r, "现金+证券-长期债务")
     r += 2
 
     sec(ws, r, "Cash Flow Quality 现金流质量"); r += 1
-    ws.cell(row=r, column=1, value="OCF / Net Income 经营现金流/净利润").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "OCF / Net Income 经营现金流/净利润")
     for c in range(2, 10):
-        fval(ws, r, c, f"=Cash_Flow!{CL(c)}{cfo_r}/{P}!{CL(c)}{ni_pl}", "0.00x")
+        fval(ws, r, c, f"=Cash_Flow!{COL[c]}{cfo_r}/{P}!{COL[c]}{ni_pl}", "0.00x")
     note(ws, r, "现金流质量，>1为佳")
     r += 1
-    ws.cell(row=r, column=1, value="FCF / Revenue 自由现金流率").font = FB; ws.cell(row=r, column=1).border = BD
+    row_label(ws, r, "FCF / Revenue 自由现金流率")
     for c in range(2, 10):
-        fval(ws, r, c, f"=Cash_Flow!{CL(c)}{fcf_r}/{P}!{CL(c)}{rev_pl}", NP)
+        pval(ws, r, c, f"=Cash_Flow!{COL[c]}{fcf_r}/{P}!{COL[c]}{rev_pl}", font=None)
     note(ws, r, "FCF/Revenue")
     r += 2
 
     sec(ws, r, "Growth 增长指标"); r += 1
     growth_items = [
-        ("Revenue Growth 收入增速", f"{P}!{{c}}{rev_pl}", f"{P}!{{p}}{rev_pl}", "YoY"),
-        ("Net Income Growth 净利润增速", f"{P}!{{c}}{ni_pl}", f"{P}!{{p}}{ni_pl}", "YoY"),
-        ("EPS Growth 每股收益增速", f"{P}!{{c}}{eps_pl}", f"{P}!{{p}}{eps_pl}", "YoY"),
+        ("Revenue Growth 收入增速", rev_pl, "YoY"),
+        ("Net Income Growth 净利润增速", ni_pl, "YoY"),
+        ("EPS Growth 每股收益增速", eps_pl, "YoY"),
     ]
-    for name, cur_t, prev_t, nt in growth_items:
-        ws.cell(row=r, column=1, value=name).font = FB; ws.cell(row=r, column=1).border = BD
-        for c in range(3, 10):
-            fval(ws, r, c, f"={cur_t.format(c=CL(c))}/{prev_t.format(p=CL(c-1))}-1", NP)
+    yoy_cols = tuple(zip(range(3, 10), COL[3:10], COL[2:9]))  # (col, letter, prior letter)
+    for name, pl_r, nt in growth_items:
+        row_label(ws, r, name)
+        tmpl = f"={P}!{{c}}{pl_r}/{P}!{{p}}{pl_r}-1".format
+        for c, cl, pl in yoy_cols:
+            pval(ws, r, c, tmpl(c=cl, p=pl), font=None)
         note(ws, r, nt)
         r += 1
     r += 1
@@ -1715,105 +1849,87 @@ def build():
         "⚠ 风险: AI CapEx回报期不确定、DOJ反垄断诉讼、Cloud竞争加剧",
         "⚠ 风险: 2025 OI&E含$24B非上市证券估值收益(不可持续)",
     ]
+    _cell = ws.cell
     for h in highlights:
-        ws.cell(row=r, column=1, value=h).font = FNOTE
+        _cell(row=r, column=1, value=h).font = FNOTE
         r += 1
 
     ws.freeze_panes = "B4"
     add_legend(ws, r + 2)
+    stream("Ratio_Analysis")
 
     # ═══════════════════════════════════════════════════
     #  FILL KEY SUMMARY (now all refs available)
     # ═══════════════════════════════════════════════════
-    ws = wb["Key_Summary"]
-    for i, h in enumerate(["核心财务指标 Key Financial Highlights", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明 Notes"]):
-        c = ws.cell(row=4, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-
-    ks_items = [
-        (5, "总收入 Total Revenue", f"Consolidated_PL!{{c}}{rev_pl}", NI, "链接自Consolidated_PL"),
-        (6, "  YoY增速 %", None, NP, ""),
-        (7, "毛利润 Gross Profit", f"Consolidated_PL!{{c}}{gp_pl}", NI, ""),
-        (8, "  毛利率 GPM %", None, NP, ""),
-        (9, "营业利润 EBIT", f"Consolidated_PL!{{c}}{ebit_pl}", NI, ""),
-        (10, "  营业利润率 OPM %", None, NP, ""),
-        (11, "净利润 Net Income", f"Consolidated_PL!{{c}}{ni_pl}", NI, ""),
-        (12, "  净利率 NPM %", None, NP, ""),
-        (13, "  NI YoY %", None, NP, ""),
-        (14, "稀释EPS", f"Consolidated_PL!{{c}}{eps_pl}", NU, ""),
-    ]
-    for rr, label, tmpl, fmt, nt in ks_items:
-        ws.cell(row=rr, column=1, value=label).font = FB; ws.cell(row=rr, column=1).border = BD
-        if tmpl:
-            for c in range(2, 8):
-                yrs = [2023,2024,2025,"2026E","2027E","2028E"]
-                # Map summary cols to PL cols: summary col 2-7 → PL col 2-7
-                lval(ws, rr, c, f"={tmpl.format(c=CL(c))}", fmt)
-        elif "YoY" in label or "yoy" in label.lower():
-            for c in range(3, 8):
-                fval(ws, rr, c, f"={CL(c)}{rr-1}/{CL(c-1)}{rr-1}-1", NP); ws.cell(row=rr, column=c).font = FSM
-        elif "GPM" in label:
-            for c in range(2, 8):
-                fval(ws, rr, c, f"={CL(c)}7/{CL(c)}5", NP); ws.cell(row=rr, column=c).font = FSM
-        elif "OPM" in label:
-            for c in range(2, 8):
-                fval(ws, rr, c, f"={CL(c)}9/{CL(c)}5", NP); ws.cell(row=rr, column=c).font = FSM
-        elif "NPM" in label:
-            for c in range(2, 8):
-                fval(ws, rr, c, f"={CL(c)}11/{CL(c)}5", NP); ws.cell(row=rr, column=c).font = FSM
-        if nt:
-            ws.cell(row=rr, column=8, value=nt).font = FNOTE; ws.cell(row=rr, column=8).border = BD
+    ws = tabs["Key_Summary"]
+    hdr_row(ws, 4, ["核心财务指标 Key Financial Highlights", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明 Notes"])
+
+    # kind -> (writer, first column); yoy rows have no 2023A prior year
+    ks_put = {
+        "link":  (lval, 2),
+        "pct":   (lambda ws, r, c, v, fmt: pval(ws, r, c, v), 2),
+        "yoy":   (lambda ws, r, c, v, fmt: pval(ws, r, c, v), 3),
+        "ratio": (lambda ws, r, c, v, fmt: pval(ws, r, c, v, font=None), 2),
+    }
+
+    def ks_rows(items):
+        """Label + B..G from one template per row; {c}/{p} are the column
+        and prior column letters"""
+        for rr, label, kind, tmpl, fmt, nt in items:
+            row_label(ws, rr, label)
+            put, c1 = ks_put[kind]
+            for c in range(c1, 8):
+                put(ws, rr, c, tmpl.format(c=COL[c], p=COL[c-1]), fmt)
+            if nt:
+                ws.cell(row=rr, column=8, value=nt).style = "aside"
+
+    # summary cols B..G map 1:1 onto the source tabs' 2023A-2028E columns
+    ks_rows([
+        (5, "总收入 Total Revenue", "link", f"=Consolidated_PL!{{c}}{rev_pl}", NI, "链接自Consolidated_PL"),
+        (6, "  YoY增速 %", "yoy", "={c}5/{p}5-1", NP, ""),
+        (7, "毛利润 Gross Profit", "link", f"=Consolidated_PL!{{c}}{gp_pl}", NI, ""),
+        (8, "  毛利率 GPM %", "pct", "={c}7/{c}5", NP, ""),
+        (9, "营业利润 EBIT", "link", f"=Consolidated_PL!{{c}}{ebit_pl}", NI, ""),
+        (10, "  营业利润率 OPM %", "pct", "={c}9/{c}5", NP, ""),
+        (11, "净利润 Net Income", "link", f"=Consolidated_PL!{{c}}{ni_pl}", NI, ""),
+        (12, "  净利率 NPM %", "pct", "={c}11/{c}5", NP, ""),
+        (13, "  NI YoY %", "yoy", "={c}12/{p}12-1", NP, ""),
+        (14, "稀释EPS", "link", f"=Consolidated_PL!{{c}}{eps_pl}", NU, ""),
+    ])
 
     # Segment revenue
     seg_hdr = 16
-    for i, h in enumerate(["分部收入结构 Revenue by Segment", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明 Notes"]):
-        c = ws.cell(row=seg_hdr, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
+    hdr_row(ws, seg_hdr, ["分部收入结构 Revenue by Segment", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明 Notes"])
 
     seg_sum_names = ["Google Services Total", "Google Cloud", "Other Bets"]
-    seg_sum_refs = [gs_total_r, R["cloud_rev"], R["ob_rev"]]
+    seg_sum_refs = [gs_total_r, R.cloud_rev, R.ob_rev]
     for idx, (nm, ref) in enumerate(zip(seg_sum_names, seg_sum_refs)):
         rr = seg_hdr + 1 + idx * 2
-        ws.cell(row=rr, column=1, value=nm).font = FB; ws.cell(row=rr, column=1).border = BD
+        row_label(ws, rr, nm)
         for c in range(2, 8):
-            lval(ws, rr, c, f"=Segment_Revenue!{CL(c)}{ref}", NI)
+            lval(ws, rr, c, f"=Segment_Revenue!{COL[c]}{ref}", NI)
         rr2 = rr + 1
-        ws.cell(row=rr2, column=1, value="  占比 %").font = FSM; ws.cell(row=rr2, column=1).border = BD
+        row_label(ws, rr2, "  占比 %", "small")
         for c in range(2, 8):
-            fval(ws, rr2, c, f"={CL(c)}{rr}/{CL(c)}5", NP); ws.cell(row=rr2, column=c).font = FSM
+            pval(ws, rr2, c, f"={COL[c]}{rr}/{COL[c]}5")
 
     # BS highlights
     bs_hdr = 24
-    for i, h in enumerate(["资产负债核心指标 Balance Sheet Highlights", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明"]):
-        c = ws.cell(row=bs_hdr, column=1+i, value=h); c.font = FW; c.fill = HDR; c.alignment = CT; c.border = BD
-
-    bs_sum = [
-        (25, "总资产 Total Assets", f"BS!{{c}}{total_assets_r}", NI, ""),
-        (26, "股东权益 Total Equity", f"BS!{{c}}{equity_r}", NI, ""),
-        (27, "现金及证券 Cash & Securities", f"BS!{{c}}{bs_rows['CashTotal']}", NI, ""),
-        (28, "ROE 净资产收益率", None, NP, "净利润/权益"),
-        (29, "ROA 总资产收益率", None, NP, "净利润/总资产"),
-    ]
-    for rr, label, tmpl, fmt, nt in bs_sum:
-        ws.cell(row=rr, column=1, value=label).font = FB; ws.cell(row=rr, column=1).border = BD
-        if tmpl:
-            for c in range(2, 8):
-                lval(ws, rr, c, f"={tmpl.format(c=CL(c))}", fmt)
-        elif "ROE" in label:
-            for c in range(2, 8):
-                fval(ws, rr, c, f"={CL(c)}11/{CL(c)}26", NP)
-        elif "ROA" in label:
-            for c in range(2, 8):
-                fval(ws, rr, c, f"={CL(c)}11/{CL(c)}25", NP)
-        if nt:
-            ws.cell(row=rr, column=8, value=nt).font = FNOTE; ws.cell(row=rr, column=8).border = BD
+    hdr_row(ws, bs_hdr, ["资产负债核心指标 Balance Sheet Highlights", "2023A", "2024A", "2025A", "2026E", "2027E", "2028E", "说明"])
+
+    ks_rows([
+        (25, "总资产 Total Assets", "link", f"=BS!{{c}}{total_assets_r}", NI, ""),
+        (26, "股东权益 Total Equity", "link", f"=BS!{{c}}{equity_r}", NI, ""),
+        (27, "现金及证券 Cash & Securities", "link", f"=BS!{{c}}{cash_sec_r}", NI, ""),
+        (28, "ROE 净资产收益率", "ratio", "={c}11/{c}26", NP, "净利润/权益"),
+        (29, "ROA 总资产收益率", "ratio", "={c}11/{c}25", NP, "净利润/总资产"),
+    ])
 
     # Investment highlights
     rr = 32
-    sec_ws = ws
-    sec_ws.cell(row=rr, column=1, value="关键投资亮点 Key Investment Highlights").font = FS
-    sec_ws.merge_cells(start_row=rr, start_column=1, end_row=rr, end_column=8)
-    for c in range(1, 9):
-        sec_ws.cell(row=rr, column=c).fill = SUB; sec_ws.cell(row=rr, column=c).border = BD
+    sec(ws, rr, "关键投资亮点 Key Investment Highlights", ncols=8)
     rr += 1
+    _cell = ws.cell
     for h in [
         "✓ AI驱动搜索广告核心引擎，Search+YouTube贡献>65%收入",
         "✓ Google Cloud 48% YoY增长(Q4'25)，利润率从5%→24%快速提升",
@@ -1822,7 +1938,7 @@ def build():
         "✓ Net cash >$80B，资产负债表极其稳健",
         "⚠ 风险：AI CapEx回报不确定、DOJ反垄断、Cloud竞争激烈",
     ]:
-        sec_ws.cell(row=rr, column=1, value=h).font = FNOTE
+        _cell(row=rr, column=1, value=h).font = FNOTE
         rr += 1
 
     add_legend(ws, rr + 1)
@@ -1831,7 +1947,15 @@ def build():
     #  SAVE
     # ═══════════════════════════════════════════════════
     out = os.path.join(r"C:\Users\lxxxxxx\Desktop\谷歌\google_financial_model_2026", "Alphabet_IB_Model_v5.xlsx")
-    wb.save(out)
+    stream(*tabs)  # Key_Summary, filled last
+    # Zip in memory, then swap the file in whole: one write, and a failed
+    # save never leaves a truncated workbook at the output path.
+    buf = io.BytesIO()
+    wb.save(buf)
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(buf.getbuffer())
+    os.replace(tmp, out)
     print(f"Saved: {out}")
 
 